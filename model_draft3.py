@@ -1,6 +1,21 @@
+import collections
+import concurrent.futures
+import itertools
+import multiprocessing
+import time
+import json
+import os
+import threading
+import importlib.util
+from types import SimpleNamespace
 import numpy as np
-import moorpy as mp
-import moorpy.helpers as helpers
+
+try:
+    import moorpy as mp
+    import moorpy.helpers as helpers
+except ImportError: # only np_backend can be used without MoorPy
+    mp = None
+    helpers = None
 
 # ---------- Header ----------
 """
@@ -22,15 +37,148 @@ TODO:
 
 """
 
+# Keywords in the order of their integer codes in the flat buffer interface (model.run_bufferA#)
+SHAPES = ("catenary", "semi-taut", "taut", "tension")
+SOILS = ("soft clay", "medium clay", "hard clay", "sand")
+MATERIALS = ("chain", "polyester", "nylon", "wire", "hmpe")
+LOAD_DIRS = ("none", "horizontal", "both", "vertical")
+ANCHORS = ("drag-embedment", "gravity", "VLA", "SEPLA", "suction", "driven")
+
+# Order of the cost columns returned by model.run_case and the batch functions
+COST_COLUMNS = ("line", "anchor", "connection", "buoy", "total")
+
+# Fairlead to anchor distance over total line length for each shape in the equilibrium check (mooring_system)
+SPANS = {"catenary" : 0.95, "semi-taut" : 0.97, "taut" : 1.0, "tension" : 1.0}
+
+# Start method for anchor solve processes. Forking copies the locks held by other threads (e.g. a thread pool 
+# running the model), so the children are started from a fresh interpreter instead
+SOLVE_CONTEXT = multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+if SOLVE_CONTEXT.get_start_method() == "forkserver":
+    SOLVE_CONTEXT.set_forkserver_preload([__name__]) # children fork from a server with this module (and MoorPy) imported
+
+def no_anchor_solver(loadx, loadz, a_type, soil_type):
+    '''Anchor solver for backends without one (np_backend). Always raises.'''
+    raise Exception(f"No anchor capacity solver available for '{a_type}' in '{soil_type}'. Fit or load an anchor surrogate covering this load")
+
+def anchor_mass(loadx, loadz, a_type, soil_type):
+    '''Runs mp.getAnchorMass for one anchor. Module level so it can be sent to worker processes.
+    
+    Parameters
+    ----------
+    loadx : float
+        horizontal anchor load [N]
+    loadz : float
+        vertical anchor load [N]
+    a_type : string
+        the anchor type
+    soil_type : string
+        the soil type
+    
+    Returns
+    -------
+    mass : float
+        the mass of the anchor [kg]
+    area : float
+        the area of the anchor [m^2] (zero if not provided by MoorPy)
+    '''
+    if mp == None:
+        raise Exception("MoorPy is required to solve for anchor mass")
+    uhc, mass, info = mp.getAnchorMass(uhc_mode = False, fx = loadx, fz = loadz, anchor = a_type, soil_type = soil_type, method = 'dynamic')
+    return mass, info.get("Area", 0.0)
+
+def guarded_solve(solver, send, loadx, loadz, a_type, soil_type):
+    '''Runs an anchor solver in a child process and sends (True, result) or (False, exception) back (see backend.solveAnchor)'''
+    try:
+        send.send((True, solver(loadx, loadz, a_type, soil_type)))
+    except Exception as e:
+        send.send((False, Exception(f"{type(e).__name__}: {e}"))) # the exception itself may not pickle
+    finally:
+        send.close()
+
+def timed_solve(solver, loadx, loadz, a_type, soil_type):
+    '''Runs an anchor solver in a pool worker and returns (True, result, seconds) or (False, exception, seconds) (see backend.compareAnchors)'''
+    start = time.perf_counter()
+    try:
+        out = (True, solver(loadx, loadz, a_type, soil_type))
+    except Exception as e:
+        out = (False, Exception(f"{type(e).__name__}: {e}")) # the exception itself may not pickle
+    return out + (time.perf_counter() - start,)
+
+class bounded_cache():
+    '''A thread safe memo that keeps the most recently used entries, so the sizing caches of a long running 
+    service do not grow without limit. Lookups refresh an entry, and the least recently used entry is dropped 
+    when a new one would exceed the size.
+    '''
+
+    def __init__(self, size):
+        self.size = size
+        self.data = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default = None):
+        with self.lock:
+            if key not in self.data:
+                return default
+            self.data.move_to_end(key)
+            return self.data[key]
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.size:
+                self.data.popitem(last = False)
+
+    def __len__(self):
+        return len(self.data)
+
+    def keys(self):
+        '''returns a snapshot of the keys, oldest first'''
+        with self.lock:
+            return list(self.data)
+
 class backend():
     '''This backend class handles the interface between the model and MoorPy, which holds the sizing tools and the 
     datasets w/ associated structures to define a mooring system. MoorPy is also responsible for calculating the 
     costs that are produced by this model.
+
+    Backend interface:
+    ------------------
+    Everything that touches MoorPy goes through four members, which is all another backend (e.g. np_backend) 
+    needs to provide. The sizing, caching, catalog, surrogate and comparison logic is shared.
+    load(path)                                       sets self.lineProps and self.pointProps
+    lineType(dnommm, material)                       returns a MoorPy style lineType dictionary
+    pointCost(design, ptype, m, a, **kwargs)         returns the cost of a point design and a point with the mass (.m)
+    anchor_solver(loadx, loadz, a_type, soil_type)   module level function returning anchor mass and area
     '''
 
-    def __init__(self):
-        '''initializes the class'''        
-        self.point_num = 0 # counter for point ID's for interfacing with MoorPy
+    anchor_solver = staticmethod(anchor_mass) # module level so it can be sent to worker processes
+    cache_size = 100000 # entries kept in the connection cost memo and in each anchor result memo (see bounded_cache)
+
+    def __init__(self, verbose = True):
+        '''initializes the class
+        
+        Parameters
+        ----------
+        verbose : bool (optional)
+            print INFO and WARNING messages
+        '''        
+        self.verbose = verbose
+        self.lock = threading.Lock() # guards writes to the shared MoorPy system so the backend can be used from multiple threads
+        self.con_cache = bounded_cache(self.cache_size) # memoized connection costs, keyed by design load [kN]
+        self.con_table = None # optional precomputed connection cost table (see build_connect_table)
+        self.con_interp = False # getConnect interpolates from the connection table by default
+        self.anchor_surrogates = {} # fitted anchor mass surrogates, keyed by soil type, anchor type and load direction
+        self.catalogs = {} # purchasable line sizes per material (see load_catalog)
+
+        # anchor solve budget (see set_anchor_budget)
+        self.anchor_timeout = None # seconds per mp.getAnchorMass call, None waits indefinitely
+        self.anchor_fallback = False # fall back to the nearest cached result when a solve fails or is over budget
+        self.anchor_slots = None # limits the number of guarded solve processes running at once
+        self.anchor_results = {} # solved anchors (bounded_cache), keyed by soil type, anchor type and load direction, then design load [kN]
+        self.anchor_times = [] # wall time of each anchor solve [s]
+        self.anchor_fallbacks = 0 # number of solves replaced by a cached result
+        self.anchor_local = threading.local() # status of the last anchor sizing in each thread
 
     # load in MoorPy data from YAMLs and set up dummy MP system
     def load(self, path = None):
@@ -41,11 +189,22 @@ class backend():
         path : list of strings
             A list of two strings holding the paths to the LineProps and PointProps yamls respectively.
         '''
+        if mp == None:
+            raise Exception("MoorPy is required for this backend. Use np_backend to run without it")
         
         if path == None:
-            self.ms = mp.System(lineProps=path, pointProps=path) # set up an empty MP system that contains the props
+            ms = mp.System(lineProps=path, pointProps=path) # set up an empty MP system that contains the props
         else:
-            self.ms = mp.System(lineProps=path[0], pointProps=path[1]) # set up an empty MP system that contains the props
+            ms = mp.System(lineProps=path[0], pointProps=path[1]) # set up an empty MP system that contains the props
+
+        # connection costs depend on the loaded pointProps, so any stored values are stale now
+        with self.lock:
+            self.ms = ms
+            self.lineProps = ms.lineProps
+            self.pointProps = ms.pointProps
+            self.con_cache = bounded_cache(self.cache_size)
+            self.con_table = None
+            self.catalogs = {} # catalog properties are filled in from lineProps
 
     ### Line Stuff
     def calc_diam(self, mbl = 0.0, mbl_0 = 0.0, mbl_d = 0.0, mbl_d2 = 0.0, mbl_d3 = 0.0, curve_min = -1, curve_max = -1):
@@ -103,13 +262,14 @@ class backend():
         if not success: 
             raise Exception(f"Diameters not found in MBL for range {curve_min} - {curve_max} m")
         elif len(diam) > 1: # this should never happen becasue curves are all strictly increasing on the range 0 - curve_max, but good to check regardless
-            print(f"WARNING: Multiple diameters found to produce MBL of {mbl} N. Diameter set to smallest, {min(diam):.3f} m")
+            if self.verbose:
+                print(f"WARNING: Multiple diameters found to produce MBL of {mbl} N. Diameter set to smallest, {min(diam):.3f} m")
         return min(diam)
 
     def find_diam(self, load, material, fos = 1):
         '''Given a line material and design load return the line diameter that
         provides the design load. This serves to wrap the calc_diam function and
-        pass the values in self.ms.lineProps for the respective material. 
+        pass the values in self.lineProps for the respective material. 
         
         Parameters
         ----------
@@ -126,17 +286,19 @@ class backend():
             the diameter of the line that meets the design load [m]
         '''
         
-        mat = self.ms.lineProps[material]       # shorthand for the sub-dictionary of properties for the material in question 
+        mat = self.lineProps[material]       # shorthand for the sub-dictionary of properties for the material in question 
         
         line_diam = self.calc_diam(mbl = load * fos, mbl_0 = mat['MBL_0'], mbl_d = mat['MBL_d'], mbl_d2 = mat['MBL_d2'], mbl_d3 = mat['MBL_d3'], curve_min = mat['MBL_dmin'], curve_max = mat['MBL_dmax'])
 
-        print(f"INFO: Line type '{material}' diameter set to {line_diam:.3f} m corresponding to MBL of {load:.3f} N")
+        if self.verbose:
+            print(f"INFO: Line type '{material}' diameter set to {line_diam:.3f} m corresponding to MBL of {load:.3f} N")
 
         return line_diam
 
-    def getLine(self, design_load = None, material = None, diam = None, fos = None):
+    def getLine(self, design_load = None, material = None, diam = None, fos = None, snap = True):
         '''calculate the diameter to get the line data structure from MoorPy.helpers
-        and checks for valid inputs.
+        and checks for valid inputs. If a catalog is loaded for the material and a design 
+        load is given, the smallest catalog size that meets the required MBL is used instead.
         
         Parameters
         ----------
@@ -148,6 +310,8 @@ class backend():
             the diameter of the line [m]
         fos : float
             factor of safety to convert from design load to line MBL
+        snap : bool (optional)
+            snap to the catalog for the material (if loaded) when sizing from a design load
             
         Returns
         -------
@@ -161,10 +325,20 @@ class backend():
         if design_load == None and diam == None:
             raise Exception("Either design load or diameter is needed to load moorpy data")
         elif design_load != None and diam != None:
-            print("WARNING: Both design load and diameter provided to getLine. input diameter will be used.")
+            if self.verbose:
+                print("WARNING: Both design load and diameter provided to getLine. input diameter will be used.")
             design_load = None
 
-        if design_load != None:
+        if design_load != None and snap and material in self.catalogs:
+            if design_load >= 0:
+                catalog = self.catalogs[material]
+                i = self.snap_diam(material, design_load*1000*fos) # convert design_load from kN to N
+                if self.verbose:
+                    print(f"INFO: Line type '{material}' snapped to catalog diameter {catalog['diam'][i]:.3f} m with MBL of {catalog['MBL'][i]:.3f} N")
+                return dict(catalog["props"][i]) # copy so the catalog entry is not modified
+            else:
+                raise Exception("Design load must be greater than zero")
+        elif design_load != None:
             if design_load >= 0: 
                 dnommm = self.find_diam(design_load*1000, material, fos=fos) / 0.001 # in mm for MP input
             else:
@@ -177,10 +351,542 @@ class backend():
         else:
             raise Exception("Somethings not right")
         
-        return helpers.getLineProps(dnommm, material, lineProps = self.ms.lineProps) # a moorpy lineType structure (dictionary)
+        return self.lineType(dnommm, material) # a moorpy lineType structure (dictionary)
+
+    def lineType(self, dnommm, material):
+        '''Gets the lineType dictionary for a diameter with MoorPy.helpers
+        
+        Parameters
+        ----------
+        dnommm : float
+            nominal diameter [mm]
+        material : string
+            the line type material keyword
+        
+        Returns
+        -------
+        dictionary
+            A lineType dictionary
+        '''
+        return helpers.getLineProps(dnommm, material, lineProps = self.lineProps)
+
+    def load_catalog(self, material, diams, mbl = None, cost = None):
+        '''Loads a catalog of purchasable sizes for a line material. The lineType dictionary 
+        for every size is built once here, so sizing against the catalog is a binary search 
+        and a table lookup.
+        
+        Parameters
+        ----------
+        material : string
+            the line type material keyword. Options are: chain, polyester, nylon, wire, hmpe
+        diams : array
+            available nominal diameters [m]
+        mbl : array (optional)
+            MBL of each size [N]. Defaults to the lineProps MBL curve
+        cost : array (optional)
+            cost of each size [$/m]. Defaults to the lineProps cost
+        
+        Returns
+        -------
+        dictionary
+            the catalog with keys "diam" [m], "MBL" [N], "cost" [$/m] (arrays sorted by MBL) and "props" (lineType dictionaries)
+        '''
+        diams = np.asarray(diams, dtype=float)
+        if len(diams) == 0 or np.any(diams <= 0):
+            raise Exception("Catalog diameters must be greater than zero")
+        order = np.argsort(diams)
+
+        props = []
+        for i in order:
+            prop = self.lineType(diams[i] / 0.001, material) # in mm for MP input
+            if mbl is not None:
+                prop["MBL"] = float(mbl[i])
+            if cost is not None:
+                prop["cost"] = float(cost[i])
+            props.append(prop)
+
+        catalog = {"diam" : diams[order], "MBL" : np.array([prop["MBL"] for prop in props]), "cost" : np.array([prop["cost"] for prop in props]), "props" : props}
+        if np.any(np.diff(catalog["MBL"]) <= 0):
+            raise Exception(f"Catalog MBL for '{material}' must increase with diameter")
+
+        self.catalogs[material] = catalog
+        return catalog
+
+    def snap_diam(self, material, mbl):
+        '''Finds the smallest catalog size with at least the required MBL
+        
+        Parameters
+        ----------
+        material : string
+            the line type material keyword
+        mbl : float or array
+            required MBL [N]
+        
+        Returns
+        -------
+        int or array
+            index (or indices) into the catalog for the material
+        '''
+        catalog = self.catalogs[material]
+        i = np.searchsorted(catalog["MBL"], mbl, side = "left")
+        if np.any(i >= len(catalog["MBL"])):
+            raise Exception(f"Required MBL of {np.max(mbl):.3f} N is above the largest '{material}' catalog size ({catalog['MBL'][-1]:.3f} N)")
+        return i
+
+    def snap_lines(self, design_loads, material, fos):
+        '''Sizes a batch of lines against the catalog for a material
+        
+        Parameters
+        ----------
+        design_loads : array
+            design loads [kN]
+        material : string
+            the line type material keyword
+        fos : float or array
+            factor of safety to convert from design load to line MBL
+        
+        Returns
+        -------
+        diam : array
+            catalog diameters [m]
+        mbl : array
+            catalog MBL [N]
+        cost : array
+            catalog cost [$/m]
+        '''
+        catalog = self.catalogs[material]
+        i = self.snap_diam(material, np.asarray(design_loads, dtype=float) * 1000 * np.asarray(fos, dtype=float)) # convert from kN to N
+        return catalog["diam"][i], catalog["MBL"][i], catalog["cost"][i]
 
     ### Point Stuff
-    def getAnchor(self, soil_type, a_type = None, load = None, load_dir = None, mass = None, area = 0.0):
+    def anchorLoads(self, load, load_dir, a_type = None):
+        '''Splits an anchor design load into horizontal and vertical components 
+        based on the load direction, and selects the default anchor type for that 
+        direction if one is not provided.
+        
+        Parameters
+        ----------
+        load : float
+            the design load for the anchor [N]
+        load_dir : string
+            keyword to identify anchor load direction. Options are: vertical, horizontal, both
+        a_type : string (optional)
+            keyword that identifies the anchor type
+            
+        Returns
+        -------
+        loadx : float
+            horizontal anchor load [N]
+        loadz : float
+            vertical anchor load [N]
+        a_type : string
+            the anchor type
+        '''
+        if load_dir == "horizontal":
+            loadx = load
+            loadz = 0.0
+
+            if a_type == None:
+                a_type = "drag-embedment"
+                if self.verbose:
+                    print(f"INFO: Anchor type set to '{a_type}'")
+
+        elif load_dir == "both":   # 45 deg hang off angle, forces split 50/50
+            loadx = np.sqrt(2*load**2)
+            loadz = loadx
+
+            if a_type == "drag-embedment":
+                if self.verbose:
+                    print("WARNING: drag embedment anchors should not be used with taut moorings")
+
+            if a_type == None:
+                a_type = "gravity"
+                if self.verbose:
+                    print(f"INFO: Anchor type set to '{a_type}'")
+
+        elif load_dir == "vertical":
+            loadx = 0.0
+            loadz = load
+
+            if a_type == "drag-embedment":
+                if self.verbose:
+                    print("WARNING: drag embedment anchors should not be used with tension moorings")
+
+            if a_type == None:
+                a_type = "gravity"
+                if self.verbose:
+                    print(f"INFO: Anchor type set to '{a_type}'")
+        else:
+            if self.verbose:
+                print("WARNING: load direction not recognized, assuming input load for vertical and horizontal and gravity anchor")
+            a_type = "gravity"
+            loadx = load
+            loadz = load
+
+        return loadx, loadz, a_type
+
+    def sizeAnchor(self, soil_type, a_type = None, load = None, load_dir = None, surrogate = False):
+        '''Finds the anchor mass and area for a design load and load direction 
+        with mp.getAnchorMass. If surrogate is True and a fitted surrogate exists 
+        for the (soil type, anchor type, load direction) inside its fitted load range, 
+        the surrogate is evaluated instead of the solver.
+        
+        Parameters
+        ----------
+        soil_type : string
+            keyword that identifies the soil type. Options are: soft clay, medium clay, hard clay, sand
+        a_type : string 
+            keyword that identifies the anchor type. Options are: drag-embedment, gravity, VLA, SEPLA, suction, driven
+        load : float
+            the design load for the anchor [kN]
+        load_dir : string
+            keyword to identify anchor load direction. Options are: vertical, horizontal, both
+        surrogate : bool (optional)
+            use a fitted anchor surrogate (see fit_anchor_surrogate) when available
+            
+        Returns
+        -------
+        mass : float
+            the mass of the anchor [kg]
+        area : float
+            the area of the anchor [m^2] (zero if not provided by MoorPy)
+        a_type : string
+            the anchor type
+        '''
+        loadx, loadz, a_type = self.anchorLoads(load * 1000, load_dir, a_type = a_type) # convert from kN to N
+
+        if surrogate:
+            fit = self.anchor_surrogates.get(self.surrogateKey(soil_type, a_type, load_dir))
+            if fit != None and load >= fit["load"][0] and load <= fit["load"][-1]:
+                mass, area = self.evalSurrogate(fit, load)
+                if self.verbose:
+                    print(f"INFO: '{a_type}' anchor mass set to {mass:.3f} kg from surrogate (max rel. error {fit['max_error']:.2%}) for load direction '{load_dir}' and soil type '{soil_type}'" )
+                self.anchor_local.status = "surrogate"
+                return mass, area, a_type
+
+        key = self.surrogateKey(soil_type, a_type, load_dir)
+        results = self.anchor_results.get(key)
+        if results == None:
+            results = self.anchor_results.setdefault(key, bounded_cache(self.cache_size))
+        cached = results.get(float(load))
+        if cached != None:
+            mass, area = cached
+            self.anchor_local.status = "cached"
+            return mass, area, a_type
+
+        try:
+            mass, area = self.solveAnchor(loadx, loadz, a_type, soil_type)
+            results[float(load)] = (mass, area)
+            self.anchor_local.status = "solved"
+        except Exception as e:
+            if not self.anchor_fallback or len(results) == 0:
+                raise
+            # nearest cached load (in log space) for the same soil, anchor type and direction
+            near = min(results.keys(), key = lambda x: abs(np.log(x) - np.log(load)) if x > 0 and load > 0 else abs(x - load))
+            mass, area = results.get(near)
+            self.anchor_fallbacks += 1
+            self.anchor_local.status = f"fallback from {near:.3f} kN"
+            if self.verbose:
+                print(f"WARNING: '{a_type}' anchor solve for {load:.3f} kN failed ({type(e).__name__}: {e}). Using cached result for {near:.3f} kN")
+
+        if self.verbose:
+            print(f"INFO: '{a_type}' anchor mass set to {mass:.3f} kg for load direction '{load_dir}' and soil type '{soil_type}'" )
+
+        return mass, area, a_type
+
+    def solveAnchor(self, loadx, loadz, a_type, soil_type):
+        '''Runs the anchor solver within the time budget and records its latency
+        
+        Parameters
+        ----------
+        loadx : float
+            horizontal anchor load [N]
+        loadz : float
+            vertical anchor load [N]
+        a_type : string
+            the anchor type
+        soil_type : string
+            the soil type
+        
+        Returns
+        -------
+        mass : float
+            the mass of the anchor [kg]
+        area : float
+            the area of the anchor [m^2]
+        '''
+        start = time.perf_counter()
+        try:
+            if self.anchor_timeout == None:
+                return self.anchor_solver(loadx, loadz, a_type, soil_type)
+            with self.anchor_slots:
+                # each guarded solve gets its own process, so one that runs over budget is terminated instead of holding a worker
+                receive, send = SOLVE_CONTEXT.Pipe(duplex = False)
+                process = SOLVE_CONTEXT.Process(target = guarded_solve, args = (self.anchor_solver, send, loadx, loadz, a_type, soil_type), daemon = True)
+                process.start()
+                send.close()
+                try:
+                    if not receive.poll(self.anchor_timeout):
+                        raise TimeoutError(f"anchor solve exceeded {self.anchor_timeout} s")
+                    try:
+                        ok, result = receive.recv()
+                    except EOFError:
+                        raise Exception(f"anchor solve process exited with code {process.exitcode}") from None
+                    if not ok:
+                        raise result
+                    return result
+                finally:
+                    if process.is_alive():
+                        process.terminate()
+                    process.join()
+                    receive.close()
+        finally:
+            self.anchor_times.append(time.perf_counter() - start)
+
+    def set_anchor_budget(self, timeout = None, fallback = True, workers = 4):
+        '''Sets a time budget for anchor solves. Solves that fail or run over the budget are 
+        replaced by the nearest cached result for the same soil, anchor type and load direction 
+        (if there is one) and flagged. mp.getAnchorMass has no iteration limit to set, so the budget 
+        is wall time only: each guarded solve runs in its own process, which is terminated when it 
+        runs over the budget.
+        
+        Parameters
+        ----------
+        timeout : float (optional)
+            seconds allowed per solve. None waits indefinitely
+        fallback : bool (optional)
+            fall back to cached results instead of raising
+        workers : int (optional)
+            guarded solve processes allowed at once
+        '''
+        self.anchor_timeout = timeout
+        self.anchor_fallback = fallback
+        self.anchor_slots = threading.BoundedSemaphore(workers)
+
+    def anchor_status(self):
+        '''Returns how the last anchor in this thread was sized: "solved", "cached", "surrogate", or "fallback from <load> kN"'''
+        return getattr(self.anchor_local, "status", None)
+
+    def anchor_latency(self):
+        '''Summarizes anchor solve wall times
+        
+        Returns
+        -------
+        dictionary
+            keys: "n" solves, "mean", "p50", "p95", "p99", "max" [s], "fallbacks" (solves replaced by cached results)
+        '''
+        times = np.array(self.anchor_times)
+        if len(times) == 0:
+            return {"n" : 0, "mean" : np.nan, "p50" : np.nan, "p95" : np.nan, "p99" : np.nan, "max" : np.nan, "fallbacks" : self.anchor_fallbacks}
+        p50, p95, p99 = np.percentile(times, [50, 95, 99])
+        return {"n" : len(times), "mean" : float(np.mean(times)), "p50" : float(p50), "p95" : float(p95), "p99" : float(p99), "max" : float(np.max(times)), "fallbacks" : self.anchor_fallbacks}
+
+    def surrogateKey(self, soil_type, a_type, load_dir):
+        '''returns the dictionary key for an anchor surrogate'''
+        return f"{soil_type}|{a_type}|{load_dir}"
+
+    def evalSurrogate(self, fit, load):
+        '''Evaluates an anchor surrogate. Mass and area are interpolated linearly in 
+        log-log space between the fitted knots, which keeps the fit monotone. 
+        
+        Parameters
+        ----------
+        fit : dictionary
+            a surrogate from fit_anchor_surrogate
+        load : float or array
+            the design load for the anchor [kN]
+            
+        Returns
+        -------
+        mass : float or array
+            the mass of the anchor [kg]
+        area : float or array
+            the area of the anchor [m^2]
+        '''
+        logload = np.log(load)
+        mass = np.exp(np.interp(logload, fit["logload"], fit["logmass"]))
+        area = np.exp(np.interp(logload, fit["logload"], fit["logarea"])) - 1.0 # area offset by 1 so zero areas survive the log
+        return mass, area
+
+    def fit_anchor_surrogate(self, soil_type, a_type, load_dir, load_min, load_max, n = 25, path = None):
+        '''Fits an anchor mass and area surrogate for one (soil type, anchor type, 
+        load direction) over a design load range by sampling mp.getAnchorMass at 
+        log-spaced loads. The fit is validated against the solver at the midpoint 
+        of every interval and the maximum relative mass error is stored with it.
+        
+        Parameters
+        ----------
+        soil_type : string
+            keyword that identifies the soil type. Options are: soft clay, medium clay, hard clay, sand
+        a_type : string 
+            keyword that identifies the anchor type. Options are: drag-embedment, gravity, VLA, SEPLA, suction, driven
+        load_dir : string
+            keyword to identify anchor load direction. Options are: vertical, horizontal, both
+        load_min : float
+            smallest design load in the fitted range [kN]
+        load_max : float
+            largest design load in the fitted range [kN]
+        n : int (optional)
+            number of knots
+        path : string (optional)
+            if given, all surrogates are saved to this .npz file (see save_anchor_surrogates)
+            
+        Returns
+        -------
+        dictionary
+            the surrogate, with keys "load", "logload", "logmass", "logarea", "max_error"
+        '''
+        if load_min <= 0 or load_max <= load_min:
+            raise Exception("Surrogate load range must satisfy 0 < load_min < load_max")
+        if n < 2:
+            raise Exception("At least two knots are needed for an anchor surrogate")
+
+        loads = np.geomspace(load_min, load_max, n)
+        samples = np.array([self.exactAnchor(soil_type, a_type, load, load_dir) for load in loads])
+        if np.any(np.diff(samples[:,0]) < 0):
+            if self.verbose:
+                print(f"WARNING: anchor mass from MoorPy is not monotone in load for '{a_type}' in '{soil_type}'. Surrogate will be monotone between knots only")
+
+        fit = {"load" : loads, "logload" : np.log(loads), "logmass" : np.log(samples[:,0]), "logarea" : np.log(samples[:,1] + 1.0), "max_error" : 0.0}
+
+        # validate at the interval midpoints (in log space)
+        mids = np.sqrt(loads[1:] * loads[:-1])
+        exact = np.array([self.exactAnchor(soil_type, a_type, load, load_dir)[0] for load in mids])
+        approx = self.evalSurrogate(fit, mids)[0]
+        fit["max_error"] = float(np.max(np.abs(approx - exact) / exact))
+
+        self.anchor_surrogates[self.surrogateKey(soil_type, a_type, load_dir)] = fit
+        if self.verbose:
+            print(f"INFO: anchor surrogate for '{a_type}' in '{soil_type}' ({load_dir}) fit over {load_min:.1f} - {load_max:.1f} kN, max rel. error {fit['max_error']:.2%}")
+
+        if path != None:
+            self.save_anchor_surrogates(path)
+
+        return fit
+
+    def exactAnchor(self, soil_type, a_type, load, load_dir):
+        '''sizes an anchor with the solver (or its cached result), raising rather than falling back'''
+        mass, area, a_type = self.sizeAnchor(soil_type, a_type = a_type, load = load, load_dir = load_dir)
+        if self.anchor_status().startswith("fallback"):
+            raise Exception(f"Anchor solve for {load:.3f} kN fell back to a cached result and cannot be used for a surrogate")
+        return mass, area
+
+    def save_anchor_surrogates(self, path):
+        '''Saves all fitted anchor surrogates to a .npz file, which is intended to 
+        be kept next to the lineProps and pointProps yamls it was fit with.
+        
+        Parameters
+        ----------
+        path : string
+            path to the .npz file
+        '''
+        arrays = {}
+        for key, fit in self.anchor_surrogates.items():
+            arrays[key+"|knots"] = np.vstack([fit["logload"], fit["logmass"], fit["logarea"]])
+            arrays[key+"|max_error"] = np.array(fit["max_error"])
+        np.savez(path, **arrays)
+
+    def load_anchor_surrogates(self, path):
+        '''Loads anchor surrogates saved by save_anchor_surrogates
+        
+        Parameters
+        ----------
+        path : string
+            path to the .npz file
+        '''
+        with np.load(path) as data:
+            for name in data.files:
+                if name.endswith("|knots"):
+                    key = name[:-len("|knots")]
+                    logload, logmass, logarea = data[name]
+                    self.anchor_surrogates[key] = {"load" : np.exp(logload), "logload" : logload, "logmass" : logmass, "logarea" : logarea, "max_error" : float(data[key+"|max_error"])}
+
+    def compareAnchors(self, soil_type, load, load_dir, workers = None, executor = None, surrogate = False):
+        '''Sizes and prices every anchor type that is valid for the load direction. The 
+        mp.getAnchorMass solves are independent so they run concurrently in a worker pool. 
+        Anchor types the solver cannot size for the soil are left as NaN. With surrogate, types with a 
+        fitted surrogate covering the load are evaluated from the surrogate without a solve. With an anchor budget (see 
+        set_anchor_budget) the solves are guarded like solveAnchor, so types over the budget are left as NaN.
+        
+        Parameters
+        ----------
+        soil_type : string
+            keyword that identifies the soil type. Options are: soft clay, medium clay, hard clay, sand
+        load : float
+            the design load for the anchor [kN]
+        load_dir : string
+            keyword to identify anchor load direction. Options are: vertical, horizontal, both
+        workers : int (optional)
+            number of worker processes if no executor is given
+        executor : concurrent.futures.Executor (optional)
+            an existing pool to run the solves on (e.g. shared across many comparisons)
+        surrogate : bool (optional)
+            use fitted anchor surrogates (see fit_anchor_surrogate) when available
+        
+        Returns
+        -------
+        dictionary
+            keys: "types" (anchor types compared), "cost" [2024$], "mass" [kg], "area" [m^2] (arrays in the order of types), "cheapest" (anchor type)
+        '''
+        if load_dir == "horizontal":
+            types = list(ANCHORS)
+        elif load_dir == "both" or load_dir == "vertical":
+            types = [a_type for a_type in ANCHORS if a_type != "drag-embedment"] # drag embedment anchors can't take vertical load
+        else:
+            raise Exception(f"Load direction '{load_dir}' is not supported for anchor comparison")
+
+        loads = [self.anchorLoads(load * 1000, load_dir, a_type = a_type)[:2] for a_type in types] # convert from kN to N
+
+        results = [None] * len(types)
+        for k, a_type in enumerate(types):
+            fit = self.anchor_surrogates.get(self.surrogateKey(soil_type, a_type, load_dir)) if surrogate else None
+            if fit != None and load >= fit["load"][0] and load <= fit["load"][-1]:
+                results[k] = self.evalSurrogate(fit, load)
+
+        solve = [k for k in range(len(types)) if results[k] == None]
+        if len(solve) > 0:
+            if self.anchor_timeout != None:
+                # guarded solves (see solveAnchor) are terminated when over budget, so a hung solve cannot block the comparison
+                pool = concurrent.futures.ThreadPoolExecutor(max_workers = len(solve))
+                futures = [pool.submit(self.solveAnchor, loads[k][0], loads[k][1], types[k], soil_type) for k in solve]
+            else:
+                pool = executor if executor != None else concurrent.futures.ProcessPoolExecutor(max_workers = workers, mp_context = SOLVE_CONTEXT)
+                futures = [pool.submit(timed_solve, self.anchor_solver, loads[k][0], loads[k][1], types[k], soil_type) for k in solve]
+            try:
+                for k, future in zip(solve, futures):
+                    try:
+                        if self.anchor_timeout != None:
+                            results[k] = future.result()
+                        else:
+                            ok, results[k], seconds = future.result()
+                            self.anchor_times.append(seconds)
+                            if not ok:
+                                raise results[k]
+                    except Exception as e:
+                        if self.verbose:
+                            print(f"WARNING: '{types[k]}' anchor could not be sized in '{soil_type}': {type(e).__name__}: {e}")
+                        results[k] = (np.nan, np.nan)
+            finally:
+                if pool is not executor:
+                    pool.shutdown()
+
+        mass = np.array([result[0] for result in results], dtype=float)
+        area = np.array([result[1] for result in results], dtype=float)
+        cost = np.full(len(types), np.nan)
+        for k, a_type in enumerate(types):
+            if not np.isnan(mass[k]):
+                cost[k] = self.getAnchor(soil_type, a_type = a_type, mass = mass[k], area = area[k])[0]
+
+        if np.all(np.isnan(cost)):
+            raise Exception(f"No anchor type could be sized for {load:.3f} kN ({load_dir}) in '{soil_type}'")
+        cheapest = types[int(np.nanargmin(cost))]
+        self.anchor_local.status = "compared"
+        if self.verbose:
+            print(f"INFO: cheapest anchor for {load:.3f} kN ({load_dir}) in '{soil_type}' is '{cheapest}'")
+
+        return {"types" : types, "cost" : cost, "mass" : mass, "area" : area, "cheapest" : cheapest}
+
+    def getAnchor(self, soil_type, a_type = None, load = None, load_dir = None, mass = None, area = 0.0, surrogate = False):
         '''This uses moorpy to calculate the anchor size needed 
         for a design load and mooring shape. This function also 
         handles autosizing and selection of anchor types based 
@@ -202,6 +908,8 @@ class backend():
             anchor mass [kg]
         area : float
             anchor area [m^2] (only used for VLA)
+        surrogate : bool (optional)
+            use a fitted anchor surrogate for sizing when available, falling back to MoorPy outside its range
             
         Returns
         -------
@@ -215,55 +923,7 @@ class backend():
 
         # Find mass if not provided. Also find anchor type if not provided
         if mass == None and load != None and load_dir != None:
-
-            load = load * 1000 # convert from kN to N
-
-            if load_dir == "horizontal":
-                loadx = load
-                loadz = 0.0
-
-                if a_type == None:
-                    a_type = "drag-embedment"
-                    print(f"INFO: Anchor type set to '{a_type}'")
-
-            elif load_dir == "both":   # 45 deg hang off angle, forces split 50/50
-                loadx = np.sqrt(2*load**2)
-                loadz = loadx
-
-                if a_type == "drag-embedment":
-                    print("WARNING: drag embedment anchors should not be used with taut moorings")
-
-                if a_type == None:
-                    a_type = "gravity"
-                    print(f"INFO: Anchor type set to '{a_type}'")
-
-            elif load_dir == "vertical":
-                loadx = 0.0
-                loadz = load
-
-                if a_type == "drag-embedment":
-                    print("WARNING: drag embedment anchors should not be used with tension moorings")
-
-                if a_type == None:
-                    a_type = "gravity"
-                    print(f"INFO: Anchor type set to '{a_type}'")
-            else:
-                print("WARNING: load direction not recognized, assuming input load for vertical and horizontal and gravity anchor")
-                a_type = "gravity"
-                loadx = load
-                loadz = load
-                        
-            outputs = mp.getAnchorMass(uhc_mode = False, fx = loadx, fz = loadz, anchor = a_type, soil_type = soil_type, method = 'dynamic')
-            if outputs == Exception:
-                raise outputs
-            
-            mass = outputs[1] # outpus = uhc, mass, info
-            if "Area" in outputs[2].keys():
-                area = outputs[2]["Area"]
-            else:
-                area = 0.0 # if there is no area value from getAnchorMass then set to 0
-
-            print(f"INFO: '{a_type}' anchor mass set to {mass:.3f} kg for load direction '{load_dir}' and soil type '{soil_type}'" )
+            mass, area, a_type = self.sizeAnchor(soil_type, a_type = a_type, load = load, load_dir = load_dir, surrogate = surrogate)
         
         else:
             if mass == None and a_type == None:
@@ -271,17 +931,52 @@ class backend():
 
         # make a design
         design = {f"num_a_{a_type}":1} # TODO: include hardware?
-        pointType = self.ms.setPointType(design)
+        cost, point = self.pointCost(design, 1, m = mass, a = area)
+
+        return cost, point.m, a_type
+    
+    def pointCost(self, design, ptype, m = None, a = None, **kwargs):
+        '''Builds a scratch MoorPy point for a point design and returns its cost. 
+        Each call makes its own point, so no state is shared between calls.
         
-        # make a point w/ design
-        self.point_num += 1 # update the point number counter
-        point = mp.Point(self.ms, self.point_num, 1, [0,0,0], typeData = pointType, m=mass, a=area) # 0,0,0 location is dummy variable to make error checks happy
+        Parameters
+        ----------
+        design : string or dictionary
+            the point design passed to MoorPy's setPointType
+        ptype : int
+            the MoorPy point type (1 for anchors, 0 otherwise)
+        m : float (optional)
+            point mass [kg]
+        a : float (optional)
+            point area [m^2]
+        kwargs
+            passed on to getCost_and_MBL (e.g. buoyancy [N], peak_tension [N])
+        
+        Returns
+        -------
+        cost : float
+            the cost of the point [2024$]
+        point : MoorPy Point
+            the scratch point
+        '''
+        ms = self.ms # local reference so a concurrent load() cannot swap the system mid-call
+        with self.lock: # setPointType may store the point type on the shared MoorPy system
+            pointType = ms.setPointType(design)
+
+        props = {}
+        if m != None:
+            props["m"] = m
+        if a != None:
+            props["a"] = a
+
+        # the point number is a dummy ID, the point is never added to the system. 0,0,0 location is dummy variable to make error checks happy
+        point = mp.Point(ms, 1, ptype, [0,0,0], typeData = pointType, **props)
 
         # getCost_and_MBL
-        cost, MBL, info = point.getCost_and_MBL()
+        cost, MBL, info = point.getCost_and_MBL(**kwargs)
+
+        return cost, point
 
-        return cost, point.m, a_type
-    
     def getBuoy(self, buoyancy):
         '''Determines the cost of a buoy based on the defaults in MoorPy.
         
@@ -300,26 +995,26 @@ class backend():
 
         # make a design
         design = {"num_b_general":1} # single buoy. TODO: include hardware?
-        pointType = self.ms.setPointType(design)
-        
-        # make a point w/ design
-        self.point_num += 1 # update the point number counter
-        point = mp.Point(self.ms, self.point_num, 0, [0,0,0], typeData = pointType) # 0,0,0 location is dummy variable to make error checks happy
-
-        # getCost_and_MBL
-        cost, MBL, info = point.getCost_and_MBL(buoyancy = buoyancy*1000) # convert buoyancy from kN to N
+        cost, point = self.pointCost(design, 0, buoyancy = buoyancy*1000) # convert buoyancy from kN to N
 
         return cost
 
-    def getConnect(self, design_load):
+    def getConnect(self, design_load, interp = None):
         '''Given a design load, calculates the cost of a connection.
         This relies on the general connection design in the default 
         PointProps yaml to determine the number of different components.
+        Costs are memoized against the design load for the loaded database,
+        so repeated queries (sweeps, batch runs) are a dictionary lookup. 
         
         Parameters
         ----------
         design_load : float
             the design load of the connection [kN]
+        interp : bool (optional)
+            if True and a connection table has been built with build_connect_table, 
+            the cost is linearly interpolated from the table when the design load is 
+            within the table range. None uses self.con_interp (set by build_connect_table), 
+            so every set_params call uses the table once it is built
         
         Returns
         -------
@@ -329,18 +1024,947 @@ class backend():
         if design_load < 0: 
             raise Exception("Design load must be greater than zero")
 
+        if interp == None:
+            interp = self.con_interp
+        table = self.con_table # local reference in case another thread rebuilds the table
+        if interp and table != None:
+            if design_load >= table["load"][0] and design_load <= table["load"][-1]:
+                return float(np.interp(design_load, table["load"], table["cost"]))
+
+        key = float(design_load)
+        cost = self.con_cache.get(key)
+        if cost != None:
+            return cost
+
         # make a design
         design = "general" # use the general design from PointProps_default
-        pointType = self.ms.setPointType(design)
+        cost, point = self.pointCost(design, 0, peak_tension = design_load*1000) # convert design_load from kN to N
+
+        self.con_cache[key] = cost
+        return cost
+
+    def build_connect_table(self, loads, use = True):
+        '''Precomputes the connection cost over a set of design loads for the 
+        loaded pointProps. The table is used by getConnect when interp = True 
+        (or by default if use is True), and every entry also seeds the exact memo.
         
-        # make a point w/ design
-        self.point_num += 1 # update the point number counter
-        point = mp.Point(self.ms, self.point_num, 0, [0,0,0], typeData = pointType) # 0,0,0 location is dummy variable to make error checks happy
+        Parameters
+        ----------
+        loads : array
+            design loads to tabulate [kN]. Does not need to be sorted
+        use : bool (optional)
+            interpolate from the table in every getConnect call inside its range (sets self.con_interp)
+        
+        Returns
+        -------
+        dictionary
+            the connection table with keys "load" [kN] and "cost" [2024$]
+        '''
+        loads = np.unique(np.asarray(loads, dtype=float)) # sorted, no duplicates
+        if len(loads) < 2:
+            raise Exception("At least two distinct design loads are needed for a connection table")
+
+        costs = np.array([self.getConnect(load, interp = False) for load in loads])
+        self.con_table = {"load" : loads, "cost" : costs}
+        self.con_interp = use
+
+        return self.con_table
+
+class np_backend(backend):
+    '''This backend evaluates the lineProps and pointProps tables directly with NumPy instead of going through 
+    MoorPy objects, so it starts fast, takes arrays, and does not need MoorPy installed. The props yamls are 
+    read with PyYAML. Line properties follow the MoorPy.helpers.getLineProps polynomials, and point costs are 
+    the polynomial cost curves in pointProps summed over the components in a design. Anchor masses come from 
+    fitted anchor surrogates (fit with the MoorPy backend and saved with save_anchor_surrogates), since there 
+    is no capacity solver here. Use compare_backends to check it against the MoorPy backend for a database.
+    '''
 
-        # getCost_and_MBL
-        cost, MBL, info = point.getCost_and_MBL(peak_tension=design_load*1000) # convert design_load from kN to N
+    anchor_solver = staticmethod(no_anchor_solver)
 
-        return cost
+    line_keys = ("mass_d2", "MBL_0", "MBL_d", "MBL_d2", "MBL_d3", "EA_0", "EA_d", "EA_d2", "EA_d3", "EA_MBL", 
+                 "cost_0", "cost_d", "cost_d2", "cost_d3", "cost_mass", "cost_EA", "cost_MBL")
+
+    def load(self, path = None):
+        '''Loads the line and point props yamls
+        
+        Parameters
+        ----------
+        path : list of strings
+            A list of two strings holding the paths to the LineProps and PointProps yamls respectively. If None, 
+            the default yamls shipped with MoorPy are used (MoorPy is located but not imported)
+        '''
+        import yaml
+
+        if path == None:
+            spec = importlib.util.find_spec("moorpy")
+            if spec == None:
+                raise Exception("MoorPy is not installed, so paths to the lineProps and pointProps yamls are required")
+            folder = spec.submodule_search_locations[0]
+            if os.path.isdir(os.path.join(folder, "library")): # the yamls moved to moorpy/library in later MoorPy versions
+                folder = os.path.join(folder, "library")
+            path = [os.path.join(folder, "MoorProps_default.yaml"), os.path.join(folder, "PointProps_default.yaml")]
+
+        with open(path[0]) as file:
+            lineProps = yaml.safe_load(file)
+        with open(path[1]) as file:
+            pointProps = yaml.safe_load(file)
+
+        lineProps = lineProps.get("lineProps", lineProps)
+        for material, mat in lineProps.items():
+            for key in list(mat.keys()):
+                try:
+                    mat[key] = float(mat[key]) # yaml gives strings for values like 20.0e3
+                except (TypeError, ValueError):
+                    pass
+            for key in np_backend.line_keys:
+                mat.setdefault(key, 0.0)
+            if "dvol_dnom" not in mat: # same default as MoorPy.helpers.loadLineProps
+                mat["dvol_dnom"] = np.sqrt((mat["mass_d2"]/mat["density"])*(4/np.pi)) if "density" in mat else 1.0
+            mat.setdefault("MBL_dmin", -1)
+            mat.setdefault("MBL_dmax", -1)
+
+        for group in pointProps.values():
+            for props in group.values():
+                if isinstance(props, dict):
+                    for key in list(props.keys()):
+                        try:
+                            props[key] = float(props[key])
+                        except (TypeError, ValueError):
+                            pass
+
+        with self.lock:
+            self.lineProps = lineProps
+            self.pointProps = pointProps
+            self.con_cache = bounded_cache(self.cache_size)
+            self.con_table = None
+            self.catalogs = {}
+
+    def lineType(self, dnommm, material):
+        '''Evaluates the lineProps polynomials for a diameter (or an array of diameters)
+        
+        Parameters
+        ----------
+        dnommm : float or array
+            nominal diameter [mm]
+        material : string
+            the line type material keyword
+        
+        Returns
+        -------
+        dictionary
+            A lineType dictionary with the same keys as MoorPy.helpers.getLineProps
+        '''
+        mat = self.lineProps[material]
+        d = np.asarray(dnommm, dtype=float) * 0.001 # m
+
+        mass = mat["mass_d2"]*d**2
+        MBL = mat["MBL_0"] + mat["MBL_d"]*d + mat["MBL_d2"]*d**2 + mat["MBL_d3"]*d**3
+        EA = mat["EA_0"] + mat["EA_d"]*d + mat["EA_d2"]*d**2 + mat["EA_d3"]*d**3 + mat["EA_MBL"]*MBL
+        d_vol = mat["dvol_dnom"]*d
+        w = (mass - np.pi/4*d_vol**2*1025)*9.81 # wet weight [N/m], seawater density 1025 kg/m^3
+        cost = mat["cost_0"] + mat["cost_d"]*d + mat["cost_d2"]*d**2 + mat["cost_d3"]*d**3 + mat["cost_mass"]*mass + mat["cost_EA"]*EA + mat["cost_MBL"]*MBL
+
+        return {"name" : f"{material}{np.round(dnommm, 1)}", "material" : material, "input_d" : d, "d_nom" : d, "d_vol" : d_vol, 
+                "m" : mass, "EA" : EA, "w" : w, "MBL" : MBL, "cost" : cost}
+
+    def pointCost(self, design, ptype, m = None, a = None, buoyancy = 0.0, peak_tension = 0.0):
+        '''Evaluates the pointProps cost curves for a point design the way MoorPy.helpers.getPointProps and 
+        Point.getCost_and_MBL do. Designs are either a name in DesignProps or a dictionary of component counts 
+        (num_a_<anchor>, num_b_<buoy>, num_c_<connector>, with optional frac_a_/frac_b_ shares of the mass, area 
+        and buoyancy). Coefficients missing from the yaml are zero.
+        
+        Parameters
+        ----------
+        design : string or dictionary
+            the point design
+        ptype : int
+            the MoorPy point type (unused)
+        m : float (optional)
+            anchor mass [kg]
+        a : float (optional)
+            anchor area [m^2]
+        buoyancy : float (optional)
+            buoyancy [N]
+        peak_tension : float (optional)
+            peak tension on connections [N]
+        
+        Returns
+        -------
+        cost : float
+            the cost of the point [2024$]
+        point : namespace
+            the point mass (.m) and area (.a)
+        '''
+        pointProps = self.pointProps
+        if isinstance(design, str):
+            design = pointProps["DesignProps"][design]
+        m = 0.0 if m == None else m
+        a = 0.0 if a == None else a
+        n_a = sum(1 for key in design if key.startswith("num_a_"))
+        n_b = sum(1 for key in design if key.startswith("num_b_"))
+
+        cost = 0.0
+        for key, num in design.items():
+            if key.startswith("num_a_"):
+                name = key[len("num_a_"):]
+                props = pointProps["AnchorProps"][name]
+                share = design.get(f"frac_a_{name}", 1/n_a) / num # each anchor of this type gets frac / num of the point mass and area
+                ma = m * share
+                aa = a * share
+                for phase in ("matcost", "instcost", "decomcost"):
+                    cost += num * (props.get(phase, 0.0) + props.get(phase+"_m", 0.0)*ma + props.get(phase+"_m2", 0.0)*ma**2 + props.get(phase+"_m3", 0.0)*ma**3 
+                                   + props.get(phase+"_a", 0.0)*aa + props.get(phase+"_a2", 0.0)*aa**2 + props.get(phase+"_a3", 0.0)*aa**3)
+            elif key.startswith("num_b_"):
+                name = key[len("num_b_"):]
+                props = pointProps["BuoyProps"][name]
+                B = buoyancy * design.get(f"frac_b_{name}", 1/n_b) / num # buoyancy of each buoy of this type
+                cost += num * (props.get("cost_b0", 0.0) + props.get("cost_b1", 0.0)*B + props.get("cost_b2", 0.0)*B**2 + props.get("cost_b3", 0.0)*B**3)
+            elif key.startswith("num_c_"):
+                props = pointProps["ConnectProps"][key[len("num_c_"):]]
+                MBL = props["FOS"] * peak_tension
+                cost += num * (props.get("cost_MBL0", 0.0) + props.get("cost_MBL1", 0.0)*MBL + props.get("cost_MBL2", 0.0)*MBL**2 + props.get("cost_MBL3", 0.0)*MBL**3)
+
+        return cost, SimpleNamespace(m = m, a = a)
+
+def compare_backends(reference, candidate, diams = np.linspace(0.02, 0.2, 10), loads = np.linspace(100, 10000, 10), masses = np.linspace(1000, 50000, 10), areas = np.linspace(1, 20, 10)):
+    '''Compares two loaded backends (e.g. backend and np_backend on the same database) on line 
+    properties, connection, buoy and anchor costs, and returns the largest relative differences.
+    
+    Parameters
+    ----------
+    reference : backend
+        the reference backend
+    candidate : backend
+        the backend being checked
+    diams : array (optional)
+        line diameters to compare [m]
+    loads : array (optional)
+        connection design loads and buoyancies to compare [kN]
+    masses : array (optional)
+        anchor masses to compare [kg]
+    areas : array (optional)
+        anchor areas to compare (used with masses) [m^2]
+    
+    Returns
+    -------
+    dictionary
+        largest relative difference per quantity, e.g. "chain MBL", "connection", "buoy", "anchor VLA"
+    '''
+    def rel(x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        return float(np.max(np.abs(y - x) / np.maximum(np.abs(x), 1e-12)))
+
+    errors = {}
+    for material in reference.lineProps:
+        if material not in candidate.lineProps:
+            continue
+        ref = [reference.lineType(d / 0.001, material) for d in diams]
+        can = [candidate.lineType(d / 0.001, material) for d in diams]
+        for key in ("m", "w", "MBL", "EA", "cost"):
+            errors[f"{material} {key}"] = rel([r[key] for r in ref], [c[key] for c in can])
+
+    errors["connection"] = rel([reference.getConnect(load) for load in loads], [candidate.getConnect(load) for load in loads])
+    errors["buoy"] = rel([reference.getBuoy(load) for load in loads], [candidate.getBuoy(load) for load in loads])
+    for a_type in reference.pointProps["AnchorProps"]: # every anchor in the database, its names may differ from ANCHORS
+        if a_type not in candidate.pointProps["AnchorProps"]:
+            continue
+        errors[f"anchor {a_type}"] = rel([reference.getAnchor("sand", a_type = a_type, mass = m, area = a)[0] for m, a in zip(masses, areas)], 
+                                         [candidate.getAnchor("sand", a_type = a_type, mass = m, area = a)[0] for m, a in zip(masses, areas)])
+    return errors
+
+def mooring_system(design, span = None, r_fair = 10.0, warm = None):
+    '''Builds the MoorPy System of a sized design: a coupled body at the origin with the lines spread 
+    evenly around it. The anchors are placed so the fairlead to anchor distance is span times the total 
+    line length, and line types with more than one segment get free points between the segments.
+    
+    Parameters
+    ----------
+    design : dictionary
+        keys: "shape", "depth" [m], "fairlead_z" [m] and "lines", a list of dictionaries ("num", "MP_data", "length" [m]) from fairlead to anchor
+    span : float (optional)
+        ratio of the fairlead to anchor distance to the total line length. Defaults to SPANS for the shape
+    r_fair : float (optional)
+        fairlead radius [m]
+    warm : array (optional)
+        free point positions divided by depth from a similar design, used as the starting positions
+    
+    Returns
+    -------
+    MoorPy System
+        the initialized system
+    '''
+    if mp == None:
+        raise Exception("MoorPy is required to build the mooring system")
+    if span == None:
+        span = SPANS[design["shape"]]
+
+    depth = design["depth"]
+    lines = design["lines"]
+    lengths = np.array([line["length"] for line in lines], dtype=float)
+    dz = depth + design["fairlead_z"]
+    radius = np.sqrt(max((span * np.sum(lengths))**2 - dz**2, 0.0))
+    # distance along the lines from the fairlead to each segment end
+    ends = np.cumsum(lengths) / np.sum(lengths)
+
+    ms = mp.System(depth = depth)
+    ms.addBody(-1, np.zeros(6))
+    for line in lines:
+        ms.lineTypes[line["MP_data"]["name"]] = line["MP_data"]
+
+    n_free = 0
+    for k in range(lines[0]["num"]):
+        u = np.array([np.cos(2*np.pi*k/lines[0]["num"]), np.sin(2*np.pi*k/lines[0]["num"]), 0.0])
+        fair = r_fair*u + np.array([0.0, 0.0, design["fairlead_z"]])
+        anch = (r_fair + radius)*u + np.array([0.0, 0.0, -depth])
+
+        ms.addPoint(1, fair)
+        ms.bodyList[0].attachPoint(len(ms.pointList), fair)
+        ids = [len(ms.pointList)]
+        for j in range(len(lines) - 1):
+            r = fair + ends[j]*(anch - fair)
+            if warm is not None and n_free < len(warm):
+                r = warm[n_free] * depth
+            r[2] = max(r[2], -depth)
+            ms.addPoint(0, r)
+            ids.append(len(ms.pointList))
+            n_free += 1
+        ms.addPoint(1, anch)
+        ids.append(len(ms.pointList))
+
+        for j, line in enumerate(lines):
+            ms.addLine(line["length"], line["MP_data"]["name"])
+            ms.pointList[ids[j] - 1].attachLine(len(ms.lineList), 1)
+            ms.pointList[ids[j+1] - 1].attachLine(len(ms.lineList), 0)
+
+    ms.initialize()
+    return ms
+
+def mooring_equilibrium(designs, offset = None, load = None, span = None, r_fair = 10.0, tol = 1e-3, max_iter = 30):
+    '''Solves the static equilibrium of designs, either at a platform offset or under a horizontal 
+    load. Designs are solved in order and each solve starts from the previous one (free point positions 
+    and the offset under load), so neighbouring designs should be next to each other. Module level so 
+    chunks can be sent to worker processes.
+    
+    Parameters
+    ----------
+    designs : list
+        design dictionaries (see mooring_system)
+    offset : float or list (optional)
+        surge offset of the platform for each design [m]
+    load : float or list (optional)
+        horizontal load on the platform for each design [kN]. The offset is solved for with a safeguarded secant method
+    span : float (optional)
+        see mooring_system
+    r_fair : float (optional)
+        fairlead radius [m]
+    tol : float (optional)
+        relative tolerance on the load
+    max_iter : int (optional)
+        maximum offset iterations per design
+    
+    Returns
+    -------
+    list
+        one dictionary per design, keys: "offset" [m], "tension" (peak line tension [kN]), "force" (mooring restoring force [kN]), "converged"
+    '''
+    if (offset is None) == (load is None):
+        raise Exception("Either offset or load is needed for the equilibrium solve")
+    n = len(designs)
+    offsets = np.broadcast_to(np.asarray(offset if offset is not None else 0.0, dtype=float), n)
+    loads = np.broadcast_to(np.asarray(load if load is not None else 0.0, dtype=float), n)
+
+    results = []
+    warm = {} # free point positions / depth and offset / depth of the last solve, keyed by shape
+    for i, design in enumerate(designs):
+        prev = warm.get(design["shape"], (None, 0.05))
+        try:
+            ms = mooring_system(design, span = span, r_fair = r_fair, warm = prev[0])
+            body = ms.bodyList[0]
+
+            def restoring(x):
+                body.setPosition([x, 0, 0, 0, 0, 0])
+                ms.solveEquilibrium()
+                for line in ms.lineList:
+                    line.staticSolve()
+                return -body.getForces(lines_only = True)[0] / 1000 # convert from N to kN
+
+            converged = True
+            if load is None:
+                x = offsets[i]
+                f = restoring(x)
+            else:
+                # secant steps from the previous design's offset, bisecting once a bracket [lo, hi] is found
+                target = loads[i]
+                lo, hi = 0.0, None
+                x_old, f_old = 0.0, restoring(0.0)
+                x = max(prev[1] * design["depth"], 1e-3)
+                converged = False
+                for _ in range(max_iter):
+                    f = restoring(x)
+                    if abs(f - target) <= tol * max(abs(target), 1e-3):
+                        converged = True
+                        break
+                    if f < target:
+                        lo = max(lo, x)
+                    else:
+                        hi = x if hi == None else min(hi, x)
+                    step = x + (target - f) * (x - x_old) / (f - f_old) if f != f_old else np.inf
+                    x_old, f_old = x, f
+                    if hi == None:
+                        x = min(step, 2 * x) if step > x else 2 * x # grow until the load is exceeded
+                        if x > 2 * design["depth"]:
+                            break
+                    else:
+                        x = step if lo < step < hi else 0.5 * (lo + hi)
+
+            tension = max(max(line.TA, line.TB) for line in ms.lineList) / 1000 # convert from N to kN
+            free = np.array([p.r for p in ms.pointList if p.type == 0], dtype=float).reshape(-1, 3)
+            warm[design["shape"]] = (free / design["depth"], x / design["depth"])
+            results.append({"offset" : x, "tension" : tension, "force" : f, "converged" : converged})
+        except Exception as e:
+            results.append({"offset" : np.nan, "tension" : np.nan, "force" : np.nan, "converged" : False, "error" : str(e)})
+
+    return results
+
+class load_pipeline():
+    '''This class reduces long tension time series (or metocean series with a transfer function to tension) 
+    to the loads used for sizing. Files are streamed in chunks, so multi-decade hourly records are never held 
+    in memory. One pass gives the annual maxima for an extreme value (Gumbel) design load and the rainflow 
+    counted T-N fatigue sum, which is independent of the line MBL so the fatigue requirement can be solved 
+    directly for the MBL.
+    '''
+
+    # T-N curves N = K * R^-M with R = tension range / MBL. From API RP 2SK (studless chain) and API RP 2SM (polyester)
+    TN_curves = {"chain" : (3.36, 370.0), "polyester" : (5.2, 25000.0)}
+
+    def __init__(self, chunk_size = 2**20, dt = 1.0, transfer = None, verbose = True):
+        '''initializes the pipeline
+        
+        Parameters
+        ----------
+        chunk_size : int (optional)
+            number of samples read from disk at a time
+        dt : float (optional)
+            time between samples [hours]
+        transfer : function (optional)
+            maps an array of metocean samples to line tension [kN]. If None the series is tension [kN]
+        verbose : bool (optional)
+            print info about the processed records
+        '''
+        self.chunk_size = int(chunk_size)
+        self.dt = dt
+        self.transfer = transfer
+        self.verbose = verbose
+
+    def iter_chunks(self, path, column = 0, skiprows = 0, delimiter = ","):
+        '''Yields a time series file in chunks. .npy files are memory mapped, anything else 
+        is read as delimited text a chunk of lines at a time.
+        
+        Parameters
+        ----------
+        path : string
+            path to the time series file
+        column : int (optional)
+            column holding the series (for 2D .npy files and text files)
+        skiprows : int (optional)
+            header lines to skip in text files
+        delimiter : string (optional)
+            text file delimiter
+        
+        Yields
+        ------
+        array
+            the next chunk of the series in tension [kN]
+        '''
+        if str(path).endswith(".npy"):
+            data = np.load(path, mmap_mode = "r")
+            for i in range(0, data.shape[0], self.chunk_size):
+                chunk = data[i:i+self.chunk_size]
+                if chunk.ndim > 1:
+                    chunk = chunk[:, column]
+                yield self.to_tension(np.array(chunk, dtype = float))
+        else:
+            with open(path) as file:
+                for _ in range(skiprows):
+                    next(file)
+                while True:
+                    lines = list(itertools.islice(file, self.chunk_size))
+                    if len(lines) == 0:
+                        break
+                    chunk = np.loadtxt(lines, delimiter = delimiter, ndmin = 2)[:, column]
+                    yield self.to_tension(chunk)
+
+    def to_tension(self, chunk):
+        '''applies the transfer function (if any) to a chunk'''
+        if self.transfer == None:
+            return chunk
+        return np.asarray(self.transfer(chunk), dtype = float)
+
+    def turning_points(self, x):
+        '''Returns the interior turning points (peaks and troughs) of a series. Plateaus are 
+        reduced to their first sample. The first and last samples are not classified.
+        
+        Parameters
+        ----------
+        x : array
+            the series
+        
+        Returns
+        -------
+        array
+            the interior turning points in order
+        '''
+        x = x[np.concatenate(([True], np.diff(x) != 0))] # drop repeated values
+        if len(x) < 3:
+            return x[1:-1]
+        d = np.diff(x)
+        return x[1:-1][d[:-1] * d[1:] < 0]
+
+    def rainflow(self, stack, points, M):
+        '''Three point rainflow counting (ASTM E1049) of new reversals onto a residual stack. 
+        Closed cycles are reduced to sum(n * range^M) right away so nothing else is kept.
+        
+        Parameters
+        ----------
+        stack : list
+            residual reversals carried between chunks (modified in place)
+        points : array
+            new reversals
+        M : float
+            T-N curve exponent
+        
+        Returns
+        -------
+        float
+            sum of range^M over the closed cycles (half cycles from the starting point count 0.5)
+        '''
+        total = 0.0
+        for p in points:
+            stack.append(p)
+            while len(stack) >= 3:
+                X = abs(stack[-1] - stack[-2])
+                Y = abs(stack[-2] - stack[-3])
+                if X < Y:
+                    break
+                if len(stack) == 3: # Y contains the starting point, count a half cycle
+                    total += 0.5 * Y**M
+                    del stack[0]
+                else:
+                    total += Y**M
+                    del stack[-3:-1]
+        return total
+
+    def process(self, path, M = 3.36, column = 0, skiprows = 0, delimiter = ","):
+        '''Makes a single pass over a time series file and returns the annual maxima and the 
+        rainflow T-N sum.
+        
+        Parameters
+        ----------
+        path : string
+            path to the time series file
+        M : float (optional)
+            T-N curve exponent
+        column, skiprows, delimiter : (optional)
+            see iter_chunks
+        
+        Returns
+        -------
+        dictionary
+            keys: "maxima" annual maxima [kN], "tn_sum" sum(n * range^M) [kN^M], "hours" record length [hours]
+        '''
+        block = int(round(8766 / self.dt)) # samples per year
+        maxima = []
+        block_max = -np.inf
+        block_n = 0
+
+        carry = None # last two distinct samples, used to classify turning points across chunk edges
+        stack = []
+        tn_sum = 0.0
+        n = 0
+
+        for chunk in self.iter_chunks(path, column = column, skiprows = skiprows, delimiter = delimiter):
+            n += len(chunk)
+
+            # annual maxima
+            i = 0
+            while i < len(chunk):
+                take = min(block - block_n, len(chunk) - i)
+                block_max = max(block_max, np.max(chunk[i:i+take]))
+                block_n += take
+                i += take
+                if block_n == block:
+                    maxima.append(block_max)
+                    block_max = -np.inf
+                    block_n = 0
+
+            # rainflow
+            if carry is None:
+                stack.append(chunk[0]) # the first sample is always a reversal
+                x = chunk
+            else:
+                x = np.concatenate((carry, chunk))
+            tn_sum += self.rainflow(stack, self.turning_points(x), M)
+            x = x[np.concatenate(([True], np.diff(x) != 0))]
+            carry = x[-2:]
+
+        if n == 0:
+            raise Exception(f"No samples found in {path}")
+
+        # the last sample closes the record, then the residue counts as half cycles
+        if carry is not None and len(carry) > 1:
+            tn_sum += self.rainflow(stack, carry[-1:], M)
+        residue = np.abs(np.diff(stack))
+        tn_sum += 0.5 * np.sum(residue**M)
+
+        if block_n > 0 and self.verbose:
+            print(f"INFO: last {block_n * self.dt:.0f} hours of record do not fill a year and are left out of the annual maxima")
+
+        return {"maxima" : np.array(maxima), "tn_sum" : tn_sum, "hours" : n * self.dt}
+
+    def extreme_load(self, maxima, return_period = 50):
+        '''Fits a Gumbel distribution to annual maxima by the method of moments and returns the 
+        load with the given return period.
+        
+        Parameters
+        ----------
+        maxima : array
+            annual maxima [kN]
+        return_period : float (optional)
+            return period [years]
+        
+        Returns
+        -------
+        float
+            the return period load [kN]
+        '''
+        if len(maxima) < 2:
+            raise Exception("At least two years of data are needed for an extreme value fit")
+        beta = np.std(maxima, ddof = 1) * np.sqrt(6) / np.pi
+        mu = np.mean(maxima) - 0.5772156649 * beta
+        return mu - beta * np.log(-np.log(1 - 1/return_period))
+
+    def fatigue_mbl(self, tn_sum, hours, K, M, design_life = 25, fatigue_fos = 3):
+        '''Returns the MBL at which the fatigue damage over the design life (times the fatigue 
+        factor of safety) equals one. Damage = tn_sum * life scale / (K * MBL^M)
+        
+        Parameters
+        ----------
+        tn_sum : float
+            rainflow T-N sum from process [kN^M]
+        hours : float
+            record length [hours]
+        K : float
+            T-N curve intercept
+        M : float
+            T-N curve exponent
+        design_life : float (optional)
+            design life [years]
+        fatigue_fos : float (optional)
+            factor of safety on fatigue damage
+        
+        Returns
+        -------
+        float
+            the MBL needed for fatigue [kN]
+        '''
+        scale = design_life * 8766 / hours
+        return (fatigue_fos * scale * tn_sum / K)**(1/M)
+
+class results_store():
+    '''This class is an append-only, on disk store for sweep results. Completed batches of cases are 
+    written as .npy shards (case index in the first column, then one column per result) and a progress 
+    file listing the finished shards is updated after each one, so an interrupted sweep can resume 
+    and skip the cases already done. Shards can be memory mapped for analysis.
+    '''
+
+    def __init__(self, path, columns = COST_COLUMNS):
+        '''opens (or creates) a store
+        
+        Parameters
+        ----------
+        path : string
+            directory holding the shards and progress file
+        columns : list (optional)
+            names of the result columns
+        '''
+        self.path = path
+        self.columns = list(columns)
+        os.makedirs(path, exist_ok = True)
+
+        self.progress_file = os.path.join(path, "progress.json")
+        if os.path.exists(self.progress_file):
+            with open(self.progress_file) as file:
+                self.progress = json.load(file)
+            if self.progress["columns"] != self.columns:
+                raise Exception(f"Results store at {path} has columns {self.progress['columns']}, not {self.columns}")
+        else:
+            self.progress = {"columns" : self.columns, "n_cases" : None, "shards" : []}
+
+    def save_progress(self):
+        '''writes the progress file atomically'''
+        temp = self.progress_file + ".tmp"
+        with open(temp, "w") as file:
+            json.dump(self.progress, file)
+        os.replace(temp, self.progress_file)
+
+    def completed(self, n_cases):
+        '''Returns which cases already have results. Also records the number of cases in the sweep, 
+        which has to match when resuming.
+        
+        Parameters
+        ----------
+        n_cases : int
+            number of cases in the sweep
+        
+        Returns
+        -------
+        array
+            boolean mask of finished cases
+        '''
+        if self.progress["n_cases"] == None:
+            self.progress["n_cases"] = n_cases
+            self.save_progress()
+        elif self.progress["n_cases"] != n_cases:
+            raise Exception(f"Results store at {self.path} is for {self.progress['n_cases']} cases, not {n_cases}")
+
+        done = np.zeros(n_cases, dtype=bool)
+        for shard in self.open_shards():
+            done[shard[:, 0].astype(int)] = True
+        return done
+
+    def write(self, indices, rows):
+        '''Writes a batch of results as a new shard and checkpoints it
+        
+        Parameters
+        ----------
+        indices : list
+            case indices of the batch
+        rows : array
+            (n, number of columns) results
+        '''
+        if len(indices) == 0:
+            return
+        shard = np.column_stack([np.asarray(indices, dtype=float), np.asarray(rows, dtype=float)])
+
+        name = f"shard_{len(self.progress['shards']):06d}.npy"
+        temp = os.path.join(self.path, name + ".tmp")
+        with open(temp, "wb") as file:
+            np.save(file, shard)
+        os.replace(temp, os.path.join(self.path, name)) # shard is complete before it is listed
+
+        self.progress["shards"].append(name)
+        self.save_progress()
+
+    def open_shards(self):
+        '''Memory maps the finished shards
+        
+        Returns
+        -------
+        list
+            read only memory mapped arrays, one per shard, with the case index in the first column
+        '''
+        return [np.load(os.path.join(self.path, name), mmap_mode = "r") for name in self.progress["shards"]]
+
+    def results(self):
+        '''Gathers all results into one array ordered by case index. Cases without results are NaN.
+        
+        Returns
+        -------
+        array
+            (number of cases, number of columns) results
+        '''
+        n = self.progress["n_cases"] if self.progress["n_cases"] != None else 0
+        out = np.full([n, len(self.columns)], np.nan)
+        for shard in self.open_shards():
+            out[shard[:, 0].astype(int)] = shard[:, 1:]
+        return out
+
+class work_queue():
+    '''This class is a file based work queue for spreading a sweep over processes or hosts that share a 
+    directory. The coordinator writes the cases as shards to pending/, and workers claim a shard by renaming 
+    it to leased/ (rename is atomic, so only one worker gets it), run it and write the costs to done/. 
+    A lease is the modification time of the leased file, refreshed while the worker runs the shard. Leases 
+    older than lease_time are from lost workers and are moved back to pending/. A shard run twice gives the 
+    same results, so a late finish from an expired lease is harmless. Results are merged in shard order.
+    '''
+
+    def __init__(self, path, lease_time = 600.0, verbose = True):
+        '''opens (or creates) a queue
+        
+        Parameters
+        ----------
+        path : string
+            directory shared by the coordinator and the workers
+        lease_time : float (optional)
+            seconds without a renewal before a leased shard is given to another worker
+        verbose : bool (optional)
+            print warnings when expired leases are requeued
+        '''
+        self.path = path
+        self.lease_time = lease_time
+        self.verbose = verbose
+        self.dirs = {name : os.path.join(path, name) for name in ("pending", "leased", "done")}
+        for folder in self.dirs.values():
+            os.makedirs(folder, exist_ok = True)
+        self.manifest_file = os.path.join(path, "queue.json")
+
+    def submit(self, cases, shard_size = 1000):
+        '''Shards a list of cases onto the queue (coordinator)
+        
+        Parameters
+        ----------
+        cases : list
+            case dictionaries (see model.run_case). Must be JSON serializable
+        shard_size : int (optional)
+            cases per shard
+        '''
+        if os.path.exists(self.manifest_file):
+            raise Exception(f"Work queue at {self.path} already has cases")
+        n_shards = (len(cases) + shard_size - 1) // shard_size
+        for k in range(n_shards):
+            start = k * shard_size
+            name = f"shard_{k:06d}.json"
+            temp = os.path.join(self.path, name + ".tmp")
+            with open(temp, "w") as file:
+                json.dump({"start" : start, "cases" : cases[start:start + shard_size]}, file)
+            os.replace(temp, os.path.join(self.dirs["pending"], name)) # shard is complete before a worker can see it
+
+        temp = self.manifest_file + ".tmp"
+        with open(temp, "w") as file:
+            json.dump({"n_cases" : len(cases), "n_shards" : n_shards, "columns" : list(COST_COLUMNS)}, file)
+        os.replace(temp, self.manifest_file)
+
+    def manifest(self):
+        '''Returns the queue manifest ("n_cases", "n_shards", "columns")'''
+        with open(self.manifest_file) as file:
+            return json.load(file)
+
+    def shards(self, folder):
+        '''Returns the shard names in pending, leased or done, in shard order'''
+        return sorted(name.split(".")[0] for name in os.listdir(self.dirs[folder]) if not name.endswith(".tmp"))
+
+    def claim(self):
+        '''Claims the first pending shard (worker)
+        
+        Returns
+        -------
+        name : string
+            the shard name, None if nothing is pending
+        shard : dictionary
+            keys: "start" (index of the first case), "cases"
+        '''
+        for name in self.shards("pending"):
+            leased = os.path.join(self.dirs["leased"], name + ".json")
+            try:
+                os.rename(os.path.join(self.dirs["pending"], name + ".json"), leased)
+            except FileNotFoundError: # another worker got it first
+                continue
+            try:
+                os.utime(leased) # start the lease
+                with open(leased) as file:
+                    return name, json.load(file)
+            except FileNotFoundError: # the old pending mtime looked expired and another worker requeued it
+                continue
+        return None, None
+
+    def renew(self, name):
+        '''Refreshes the lease on a shard (worker). Returns False if the lease expired and the shard was requeued'''
+        try:
+            os.utime(os.path.join(self.dirs["leased"], name + ".json"))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def complete(self, name, start, rows):
+        '''Writes the costs of a shard and releases its lease (worker)
+        
+        Parameters
+        ----------
+        name : string
+            the shard name
+        start : int
+            index of the first case in the shard
+        rows : array
+            (n, 5) costs of the shard's cases in the order of COST_COLUMNS
+        '''
+        rows = np.asarray(rows, dtype=float)
+        shard = np.column_stack([start + np.arange(len(rows), dtype=float), rows])
+        temp = os.path.join(self.path, name + ".npy.tmp")
+        with open(temp, "wb") as file:
+            np.save(file, shard)
+        os.replace(temp, os.path.join(self.dirs["done"], name + ".npy"))
+        for folder in ("leased", "pending"): # pending if the lease expired while running
+            try:
+                os.remove(os.path.join(self.dirs[folder], name + ".json"))
+            except FileNotFoundError:
+                pass
+
+    def requeue_expired(self):
+        '''Moves shards with expired leases back to pending
+        
+        Returns
+        -------
+        list
+            names of the requeued shards
+        '''
+        requeued = []
+        done = set(self.shards("done"))
+        now = time.time()
+        for name in self.shards("leased"):
+            leased = os.path.join(self.dirs["leased"], name + ".json")
+            try:
+                if name in done:
+                    os.remove(leased)
+                elif now - os.path.getmtime(leased) > self.lease_time:
+                    os.rename(leased, os.path.join(self.dirs["pending"], name + ".json"))
+                    requeued.append(name)
+            except FileNotFoundError: # completed or requeued by someone else
+                continue
+        return requeued
+
+    def finished(self):
+        '''Returns True when every shard has results'''
+        return len(self.shards("done")) == self.manifest()["n_shards"]
+
+    def wait(self, poll = 1.0, timeout = None):
+        '''Waits for the workers to finish every shard (coordinator), requeuing expired leases
+        
+        Parameters
+        ----------
+        poll : float (optional)
+            seconds between checks
+        timeout : float (optional)
+            seconds to wait before raising. None waits indefinitely
+        
+        Returns
+        -------
+        array
+            (number of cases, 5) merged costs (see results)
+        '''
+        start = time.time()
+        while not self.finished():
+            if timeout != None and time.time() - start > timeout:
+                raise Exception(f"Work queue at {self.path} did not finish in {timeout} s ({len(self.shards('done'))} of {self.manifest()['n_shards']} shards done)")
+            requeued = self.requeue_expired()
+            if len(requeued) > 0 and self.verbose:
+                print(f"WARNING: requeued shards with expired leases: {requeued}")
+            time.sleep(poll)
+        return self.results()
+
+    def results(self):
+        '''Merges the finished shards in shard order. Cases without results are NaN.
+        
+        Returns
+        -------
+        array
+            (number of cases, 5) costs in the order of COST_COLUMNS
+        '''
+        out = np.full([self.manifest()["n_cases"], len(COST_COLUMNS)], np.nan)
+        for name in self.shards("done"):
+            shard = np.load(os.path.join(self.dirs["done"], name + ".npy"))
+            out[shard[:, 0].astype(int)] = shard[:, 1:]
+        return out
 
 # User interface class and functions
 class model():
@@ -411,26 +2035,232 @@ class model():
     both
     vertical
 
+    Threading:
+    ----------
+    The system state written by the set_params functions (listed in model.scratch) is stored per thread, 
+    so one model can be shared by a thread pool as long as each thread calls set_params# and calc_cost itself. 
+    Use get_state/set_state to move a result between threads.
+
     """
 
-    def __init__(self):
-        '''Initializes the data structures for running the model, including the backend class'''
+    # attributes written by set_params#, stored per thread
+    scratch = ("depth", "inflation_scale", "nLineTypes", "LineTypes", "nAnchTypes", "AnchTypes", "nBuoyTypes", "BuoyTypes", "con_cost")
+
+    # columns of the input tables by input level, as (name, check). Checks are a tuple of keywords, "count" (integer >= 0), 
+    # "positive" (> 0) or "nonnegative" (>= 0). See validate_tables
+    buoy_columns = (("Num of these buoys", "count"), ("Buoyancy", "nonnegative"))
+    table_columns = {
+        "Line_Table" : {2 : (("Num of these lines", "count"), ("Line material", MATERIALS), ("Diameter", "positive"), ("Factor of safety", "positive"), ("Length", "nonnegative"), 
+                             ("Anchor load direction", LOAD_DIRS), ("Number of anchors", "count"), ("Num connections", "count")), 
+                        3 : (("Num of these lines", "count"), ("Line material", MATERIALS), ("Diameter", "positive"), ("Factor of safety", "positive"), ("Length", "nonnegative"), 
+                             ("Num connections", "count"))}, 
+        "Anchor_Table" : {3 : (("Num of these anchors", "count"), ("Anchor type", ANCHORS), ("Mass", "nonnegative"), ("Area", "nonnegative"), ("Soil type", SOILS))}, 
+        "Buoy_Table" : {1 : buoy_columns, 2 : buoy_columns, 3 : buoy_columns}}
+
+    def __init__(self, verbose = True, props_backend = None):
+        '''Initializes the data structures for running the model, including the backend class
+        
+        Parameters
+        ----------
+        verbose : bool (optional)
+            print INFO and WARNING messages from sizing (the cost report from calc_cost is controlled separately)
+        props_backend : backend (optional)
+            the backend instance to use, e.g. np_backend(). Defaults to a new MoorPy backend. A backend can be shared between models
+        '''
+        self._local = threading.local() # per thread system state (see model.scratch)
         # structures for tables
-        self.line_type = {"id" : None, "num" : None, "MP_data" : None, "length" : None, "shape" : None, "design_load" : None, "FOS" : None, "nAnch" : None, "aLoadDir" : None, "nCon" : None}
-        self.anchor_type = {"id" : None, "num" : None, "kind" : None, "mass" : None, "area" : None, "soil_type" : None}
+        self.line_type = {"id" : None, "num" : None, "MP_data" : None, "length" : None, "shape" : None, "design_load" : None, "FOS" : None, "nAnch" : None, "aLoadDir" : None, "nCon" : None, "governing" : None}
+        self.anchor_type = {"id" : None, "num" : None, "kind" : None, "mass" : None, "area" : None, "soil_type" : None, "governing" : None, "status" : None}
         self.buoy_type = {"id" : None, "num" : None, "buoyancy" : None}
-        self.backend = backend() # initialize the backend
+        self.backend = props_backend if props_backend != None else backend(verbose = verbose) # initialize the backend
+        self.anchor_surrogate = False # size anchors with fitted surrogates where available (see backend.fit_anchor_surrogate)
+        self.scenario_backends = {} # backends loaded by calc_cost_scenarios, keyed by database paths
+        self.surface = None # precomputed A1 cost grid (see build_surface)
+        self.workers = None # worker processes for anchor comparisons (None lets concurrent.futures decide)
+        self.executor = None # persistent worker pool for anchor comparisons, made on first use (see comparison_pool)
+        self.executor_lock = threading.Lock()
+
+    def __getattr__(self, name):
+        '''looks up per thread system state. Only called when normal attribute lookup fails'''
+        if name in model.scratch and "_local" in self.__dict__:
+            try:
+                return getattr(self.__dict__["_local"], name)
+            except AttributeError:
+                raise AttributeError(f"'{name}' has not been set in this thread. Call a set_params function first") from None
+        raise AttributeError(f"'model' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        '''stores system state per thread, everything else on the model'''
+        if name in model.scratch:
+            setattr(self._local, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def comparison_pool(self):
+        '''Returns the worker pool for anchor comparisons, starting it with self.workers processes on first use. 
+        The pool is kept so sweeps and batches do not start processes for every case. Release it with close.'''
+        with self.executor_lock:
+            if self.executor == None:
+                self.executor = concurrent.futures.ProcessPoolExecutor(max_workers = self.workers, mp_context = SOLVE_CONTEXT)
+            return self.executor
+
+    def close(self):
+        '''Shuts down the anchor comparison pool. A later comparison starts a new one'''
+        with self.executor_lock:
+            if self.executor != None:
+                self.executor.shutdown()
+                self.executor = None
+
+    def get_state(self):
+        '''Returns the system state set by the last set_params call in this thread
+        
+        Returns
+        -------
+        dictionary
+            the values of the attributes in model.scratch
+        '''
+        return {name : getattr(self._local, name) for name in model.scratch if hasattr(self._local, name)}
+
+    def set_state(self, state):
+        '''Sets the system state in this thread, e.g. from get_state in another thread
+        
+        Parameters
+        ----------
+        state : dictionary
+            values for the attributes in model.scratch
+        '''
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def load_database(self, path = None):
+        '''Loads the lineProps and pointProps databases for determining mooring costs
+        
+        Parameters
+        ----------
+        path : list of strings
+            A two element list of strings, that contains the paths to the lineProps and pointProps yamls to use with MoorPy.helpers. 
+            If no path is given the default yamls in MoorPy are used.
+        '''
+        self.backend.load(path)
+
+    def load_catalog(self, material, diams, mbl = None, cost = None):
+        '''Loads a catalog of purchasable sizes for a line material. Lines of that material sized 
+        from a design load are then snapped to the smallest catalog size meeting the required MBL. 
+        Catalogs are cleared by load_database.
+        
+        Parameters
+        ----------
+        material : string
+            the line type material keyword. Options are: chain, polyester, nylon, wire, hmpe
+        diams : array
+            available nominal diameters [m]
+        mbl : array (optional)
+            MBL of each size [N]. Defaults to the lineProps MBL curve
+        cost : array (optional)
+            cost of each size [$/m]. Defaults to the lineProps cost
+        '''
+        self.backend.load_catalog(material, diams, mbl = mbl, cost = cost)
 
-    def load_database(self, path = None):
-        '''Loads the lineProps and pointProps databases for determining mooring costs
+    def load_anchor_surrogates(self, path):
+        '''Loads fitted anchor surrogates and turns on surrogate anchor sizing. Loads outside 
+        a surrogate's fitted range, or without a matching surrogate, still use the MoorPy solver.
         
         Parameters
         ----------
-        path : list of strings
-            A two element list of strings, that contains the paths to the lineProps and pointProps yamls to use with MoorPy.helpers. 
-            If no path is given the default yamls in MoorPy are used.
+        path : string
+            path to the .npz file saved by backend.save_anchor_surrogates
         '''
-        self.backend.load(path)
+        self.backend.load_anchor_surrogates(path)
+        self.anchor_surrogate = True
+
+    def design_load_from_series(self, path, material = "chain", fos = 2, return_period = 50, design_life = 25, fatigue_fos = 3, M = None, K = None, dt = 1.0, transfer = None, chunk_size = 2**20, column = 0, skiprows = 0, delimiter = ","):
+        '''Finds the design loads for a line from a tension (or metocean) time series on disk. 
+        The design load is the return period extreme load, which sizes the anchors, connections and 
+        line lengths. The line MBL is the larger of the extreme load * fos and the MBL that passes the 
+        T-N fatigue check over the design life. Fatigue only sets the MBL, so it is given as a load 
+        case with the extreme load and the matching factor of safety: pass the returned Load_Table to 
+        set_paramsA1 (see set_paramsA1_series).
+        
+        Parameters
+        ----------
+        path : string
+            path to the time series (.npy or delimited text). Tension in kN unless transfer is given
+        material : string (optional)
+            line material, used to pick the T-N curve if M and K are not given. Options with defaults are: chain, polyester
+        fos : float (optional)
+            factor of safety to convert from the extreme load to line MBL
+        return_period : float (optional)
+            extreme load return period [years]
+        design_life : float (optional)
+            fatigue design life [years]
+        fatigue_fos : float (optional)
+            factor of safety on fatigue damage
+        M, K : float (optional)
+            T-N curve N = K * (range/MBL)^-M
+        dt : float (optional)
+            time between samples [hours]
+        transfer : function (optional)
+            maps an array of metocean samples to line tension [kN]
+        chunk_size : int (optional)
+            samples read from disk at a time
+        column, skiprows, delimiter : (optional)
+            file layout, see load_pipeline.iter_chunks
+        
+        Returns
+        -------
+        dictionary
+            keys: "design_load" (the extreme load) [kN], "extreme_load" [kN], "fatigue_mbl" [kN], "mbl" (line MBL) [kN], 
+            "governing" ("extreme" or "fatigue", for the MBL), "damage" (life fatigue damage at the line MBL), 
+            "Load_Table" (the extreme and fatigue load cases, see set_paramsA1)
+        '''
+        if M == None or K == None:
+            if material not in load_pipeline.TN_curves:
+                raise Exception(f"No default T-N curve for '{material}'. Provide M and K")
+            M, K = load_pipeline.TN_curves[material]
+
+        pipeline = load_pipeline(chunk_size = chunk_size, dt = dt, transfer = transfer, verbose = self.backend.verbose)
+        stats = pipeline.process(path, M = M, column = column, skiprows = skiprows, delimiter = delimiter)
+
+        extreme_load = pipeline.extreme_load(stats["maxima"], return_period = return_period)
+        if not extreme_load > 0:
+            raise Exception(f"The {return_period:.0f} year load must be greater than zero, not {extreme_load}")
+        fatigue_mbl = pipeline.fatigue_mbl(stats["tn_sum"], stats["hours"], K, M, design_life = design_life, fatigue_fos = fatigue_fos)
+
+        mbl = max(extreme_load * fos, fatigue_mbl)
+        governing = "extreme" if extreme_load * fos >= fatigue_mbl else "fatigue"
+        damage = stats["tn_sum"] * design_life * 8766 / stats["hours"] / (K * mbl**M)
+
+        if self.backend.verbose:
+            print(f"INFO: {stats['hours']/8766:.1f} years of data. Design load set to the {return_period:.0f} year load, {extreme_load:.3f} kN. Line MBL {mbl:.3f} kN ({governing} governs, fatigue needs {fatigue_mbl:.3f} kN)")
+
+        Load_Table = [["extreme", extreme_load, fos, "none"], ["fatigue", extreme_load, fatigue_mbl / extreme_load, "none"]]
+        return {"design_load" : extreme_load, "extreme_load" : extreme_load, "fatigue_mbl" : fatigue_mbl, "mbl" : mbl, "governing" : governing, "damage" : damage, "Load_Table" : Load_Table}
+
+    def set_paramsA1_series(self, path, shape = "catenary", depth = None, soil_type = "sand", Buoy_Table = [], inflation_scale = 1, anchor_select = "default", **kwargs):
+        '''Sizes an A1 system from a tension (or metocean) time series on disk instead of a design load. 
+        The series is reduced with design_load_from_series and its load cases are passed to set_paramsA1, 
+        so the line MBL covers the extreme load and the fatigue requirement, and the anchors, connections 
+        and line lengths are sized for the extreme load.
+        
+        Parameters
+        ----------
+        path : string
+            path to the time series, see design_load_from_series
+        shape, depth, soil_type, Buoy_Table, inflation_scale, anchor_select : (optional)
+            see set_paramsA1
+        kwargs
+            keyword arguments of design_load_from_series. The T-N curve material defaults to the 
+            material of the shape's anchored line (chain for catenary and semi-taut, polyester for taut)
+        
+        Returns
+        -------
+        dictionary
+            the design loads, see design_load_from_series
+        '''
+        kwargs.setdefault("material", {"catenary" : "chain", "semi-taut" : "chain", "taut" : "polyester", "tension" : "hmpe"}.get(shape))
+        loads = self.design_load_from_series(path, **kwargs)
+        self.set_paramsA1(shape = shape, depth = depth, soil_type = soil_type, Buoy_Table = Buoy_Table, inflation_scale = inflation_scale, anchor_select = anchor_select, Load_Table = loads["Load_Table"])
+        return loads
 
     def set_nLineTypes(self, n):
         '''sets the number of line types
@@ -471,6 +2301,128 @@ class model():
         for i in range(n):
             self.BuoyTypes.append(self.buoy_type.copy())
 
+    def size_anchor(self, soil_type, design_load, load_dir, anchor_select = "default"):
+        '''Sizes and prices the anchor for a line type
+        
+        Parameters
+        ----------
+        soil_type : string
+            the type of soil. Options are: soft clay, medium clay, hard clay, sand
+        design_load : float
+            the design load of the line [kN]
+        load_dir : string
+            anchor load direction. Options are: horizontal, both, vertical
+        anchor_select : string (optional)
+            "default" picks the anchor type from the load direction, "cheapest" compares all valid anchor types
+        
+        Returns
+        -------
+        cost : float
+            the cost of the anchor [2024$]
+        mass : float
+            the mass of the anchor [kg]
+        area : float
+            the area of the anchor [m^2]
+        kind : string
+            the anchor type
+        '''
+        if anchor_select == "cheapest":
+            comparison = self.backend.compareAnchors(soil_type, design_load, load_dir, executor = self.comparison_pool(), surrogate = self.anchor_surrogate)
+            k = comparison["types"].index(comparison["cheapest"])
+            return comparison["cost"][k], comparison["mass"][k], comparison["area"][k], comparison["cheapest"]
+        elif anchor_select != "default":
+            raise Exception(f"Anchor selection '{anchor_select}' is not supported")
+
+        mass, area, kind = self.backend.sizeAnchor(soil_type, load = design_load, load_dir = load_dir, surrogate = self.anchor_surrogate)
+        cost = self.backend.getAnchor(soil_type, a_type = kind, mass = mass, area = area)[0]
+        return cost, mass, area, kind
+
+    def load_envelope(self, Load_Table):
+        '''Evaluates a table of load cases as arrays and finds the case needing the largest line MBL
+        
+        Parameters
+        ----------
+        Load_Table : list
+            a list of lists, one for each load case. Values are: "Case name", "Design load [kN]", "Factor of safety", "Anchor load direction"
+        
+        Returns
+        -------
+        dictionary
+            keys: "names", "loads" [kN], "fos", "dirs" (arrays), "mbl" required MBL per case [kN], "governing" (index of the case needing 
+            the largest MBL), "peak" (index of the case with the largest load)
+        '''
+        names = [str(row[0]) for row in Load_Table]
+        loads = np.array([row[1] for row in Load_Table], dtype=float)
+        fos = np.array([row[2] for row in Load_Table], dtype=float)
+        dirs = [row[3] if row[3] != None else "none" for row in Load_Table]
+        if np.any(loads < 0) or np.any(fos <= 0):
+            raise Exception("Load case design loads must be greater than zero and factors of safety positive")
+
+        mbl = loads * fos
+        return {"names" : names, "loads" : loads, "fos" : fos, "dirs" : dirs, "mbl" : mbl, "governing" : int(np.argmax(mbl)), "peak" : int(np.argmax(loads))}
+
+    def size_anchor_envelope(self, soil_type, loads, dirs, anchor_select = "default"):
+        '''Sizes the anchor for several load cases. Only the largest load in each load direction 
+        can govern, so one anchor is sized per direction, all of the same type, and the heaviest 
+        (or with "cheapest", the type whose worst case is cheapest) is kept. The type is the default 
+        for the most vertical direction present, since it has to hold every case.
+        
+        Parameters
+        ----------
+        soil_type : string
+            the type of soil. Options are: soft clay, medium clay, hard clay, sand
+        loads : array
+            anchor design load for each case [kN]
+        dirs : list
+            anchor load direction for each case. Options are: horizontal, both, vertical
+        anchor_select : string (optional)
+            "default" or "cheapest", see size_anchor
+        
+        Returns
+        -------
+        cost : float
+            the cost of the anchor [2024$]
+        mass : float
+            the mass of the anchor [kg]
+        area : float
+            the area of the anchor [m^2]
+        kind : string
+            the anchor type
+        governing : int
+            index of the governing load case
+        '''
+        loads = np.asarray(loads, dtype=float)
+        dirs = np.asarray(dirs)
+        if np.any(dirs == "none"):
+            raise Exception("Anchor direction cannot be 'none' for load cases on lines with anchors")
+
+        # governing case per direction
+        groups = [d for d in ("vertical", "both", "horizontal") if np.any(dirs == d)] # most vertical first
+        cases = [int(np.flatnonzero(dirs == d)[np.argmax(loads[dirs == d])]) for d in groups]
+
+        if anchor_select == "cheapest":
+            comparisons = [self.backend.compareAnchors(soil_type, loads[k], dirs[k], executor = self.comparison_pool(), surrogate = self.anchor_surrogate) for k in cases]
+            kinds = comparisons[0]["types"] # the most vertical direction allows the fewest types
+            cost = np.array([[c["cost"][c["types"].index(kind)] for kind in kinds] for c in comparisons]) # directions x anchor types
+            worst = np.argmax(np.where(np.isnan(cost), -np.inf, cost), axis = 0)
+            envelope = np.max(cost, axis = 0) # NaN if any direction could not be sized
+            if np.all(np.isnan(envelope)):
+                raise Exception(f"No anchor type could be sized for every load case in '{soil_type}'")
+            t = int(np.nanargmin(envelope))
+            g = int(worst[t])
+            c = comparisons[g]
+            j = c["types"].index(kinds[t])
+            return c["cost"][j], c["mass"][j], c["area"][j], kinds[t], cases[g]
+        elif anchor_select != "default":
+            raise Exception(f"Anchor selection '{anchor_select}' is not supported")
+
+        kind = self.backend.anchorLoads(1.0, groups[0])[2]
+        sized = [self.backend.sizeAnchor(soil_type, a_type = kind, load = loads[k], load_dir = dirs[k], surrogate = self.anchor_surrogate) for k in cases]
+        g = int(np.argmax([mass for mass, area, kind in sized]))
+        mass, area, kind = sized[g]
+        cost = self.backend.getAnchor(soil_type, a_type = kind, mass = mass, area = area)[0]
+        return cost, mass, area, kind, cases[g]
+
     def set_paramsA0(self):
         '''Calculates the default mooring system design with no user inputs. This is a testing function.
         '''
@@ -509,12 +2461,13 @@ class model():
         self.set_nAnchTypes(1)
         self.AnchTypes[0]["num"] = self.LineTypes[0]["nAnch"]
         self.AnchTypes[0]["soil_type"] = soil_type
-        self.AnchTypes[0]["cost"], self.AnchTypes[0]["mass"], self.AnchTypes[0]["kind"] = self.backend.getAnchor(self.AnchTypes[0]["soil_type"], load = self.LineTypes[0]["design_load"], load_dir = self.LineTypes[0]["aLoadDir"])
+        self.AnchTypes[0]["mass"], self.AnchTypes[0]["area"], self.AnchTypes[0]["kind"] = self.backend.sizeAnchor(self.AnchTypes[0]["soil_type"], load = self.LineTypes[0]["design_load"], load_dir = self.LineTypes[0]["aLoadDir"], surrogate = self.anchor_surrogate)
+        self.AnchTypes[0]["cost"] = self.backend.getAnchor(self.AnchTypes[0]["soil_type"], a_type = self.AnchTypes[0]["kind"], mass = self.AnchTypes[0]["mass"], area = self.AnchTypes[0]["area"])[0]
 
         # buoy values (optional)
         self.set_nBuoyTypes(0)
 
-    def set_paramsA1(self, shape = "catenary", depth = None, soil_type = "sand", design_load = None, Buoy_Table = [], inflation_scale = 1):
+    def set_paramsA1(self, shape = "catenary", depth = None, soil_type = "sand", design_load = None, Buoy_Table = [], inflation_scale = 1, anchor_select = "default", Load_Table = None):
         '''Calculates the mooring system parameters, including unit cost,
         based on a low level of user inputs (similar to existing SAM inputs). 
         
@@ -532,8 +2485,35 @@ class model():
             a list of lists containing buoy parameters. Values are: "Num of these buoys", "Buoyancy [kN]"
         inflation_scale : float
             value to scale costs by to account for inflation from 2024$
+        anchor_select : string (optional)
+            "default" picks the anchor type from the load direction, "cheapest" sizes every valid anchor type and keeps the cheapest (see backend.compareAnchors)
+        Load_Table : list (optional)
+            a list of lists, one for each load case, used instead of design_load. Values are: "Case name", "Design load [kN]", "Factor of safety", 
+            "Anchor load direction" (none to keep the shape's direction). A1 line types share one design load, so the table applies to every 
+            line type: line MBL is sized for the case needing the largest MBL, line lengths and connections for the largest load, 
+            and anchors for the envelope of the anchor loads
         '''
-        print("INFO: Using SAM level user provided parameters")
+        if self.backend.verbose:
+            print("INFO: Using SAM level user provided parameters")
+
+        # assume fos of 2
+        fos = 2
+
+        # load cases
+        if Load_Table != None:
+            if len(Load_Table) == 0 or len(Load_Table[0]) != 4:
+                raise Exception("Load table must have 4 columns and at least one row")
+            cases = self.load_envelope(Load_Table)
+            line_load = cases["loads"][cases["governing"]] # the case needing the largest MBL sizes the line, with its FOS
+            fos = cases["fos"][cases["governing"]]
+            design_load = cases["loads"][cases["peak"]] # the largest load is the peak tension, used for line lengths and connections
+            if self.backend.verbose:
+                print(f"INFO: load case '{cases['names'][cases['governing']]}' governs line sizing ({line_load:.3f} kN, FOS {fos})")
+                print(f"INFO: load case '{cases['names'][cases['peak']]}' has the peak tension ({design_load:.3f} kN), used for line lengths and connections")
+        elif design_load == None:
+            raise Exception("Either design_load or Load_Table is needed for A1")
+        else:
+            line_load = design_load
 
         # check table lengths
         if len(Buoy_Table) > 0:
@@ -544,20 +2524,18 @@ class model():
         self.depth = depth
 
         if self.depth < 50 and (shape == "semi-taut" or shape == "tension"):
-            print("WARNING: A1 may not be accurate in water depths less than 50 m for TLP's and semi-taut due to hardcoded assumptions")
+            if self.backend.verbose:
+                print("WARNING: A1 may not be accurate in water depths less than 50 m for TLP's and semi-taut due to hardcoded assumptions")
         
         # inflation adjustment from 2024$
         self.inflation_scale = inflation_scale # optional
 
-        # assume fos of 2
-        fos = 2
-
         # Line values (based on shape, depth, and design load)
         if shape == "catenary":
             self.set_nLineTypes(1)
             self.LineTypes[0]["id"] = 0
             # Load line type data from MoorProps
-            self.LineTypes[0]["MP_data"] = self.backend.getLine(design_load=design_load, material="chain", fos=fos)
+            self.LineTypes[0]["MP_data"] = self.backend.getLine(design_load=line_load, material="chain", fos=fos)
             # user inputs
             self.LineTypes[0]["shape"] = shape
             self.LineTypes[0]["design_load"] = design_load
@@ -573,8 +2551,8 @@ class model():
             self.LineTypes[0]["id"] = 0
             self.LineTypes[1]["id"] = 1
             # Load line type data from MoorProps
-            self.LineTypes[0]["MP_data"] = self.backend.getLine(design_load=design_load, material="polyester", fos=fos)
-            self.LineTypes[1]["MP_data"] = self.backend.getLine(design_load=design_load, material="chain", fos=fos)
+            self.LineTypes[0]["MP_data"] = self.backend.getLine(design_load=line_load, material="polyester", fos=fos)
+            self.LineTypes[1]["MP_data"] = self.backend.getLine(design_load=line_load, material="chain", fos=fos)
             # user inputs
             self.LineTypes[0]["shape"] = shape
             self.LineTypes[1]["shape"] = shape
@@ -598,7 +2576,7 @@ class model():
             self.set_nLineTypes(1)
             self.LineTypes[0]["id"] = 0
             # Load line type data from MoorProps
-            self.LineTypes[0]["MP_data"] = self.backend.getLine(design_load=design_load, material="polyester", fos=fos)
+            self.LineTypes[0]["MP_data"] = self.backend.getLine(design_load=line_load, material="polyester", fos=fos)
             # user inputs
             self.LineTypes[0]["shape"] = shape
             self.LineTypes[0]["design_load"] = design_load
@@ -614,7 +2592,7 @@ class model():
             self.set_nLineTypes(1)
             self.LineTypes[0]["id"] = 0
             # Load line type data from MoorProps
-            self.LineTypes[0]["MP_data"] = self.backend.getLine(design_load=design_load, material="hmpe", fos=fos)
+            self.LineTypes[0]["MP_data"] = self.backend.getLine(design_load=line_load, material="hmpe", fos=fos)
             # user inputs
             self.LineTypes[0]["shape"] = shape
             self.LineTypes[0]["design_load"] = design_load
@@ -627,7 +2605,7 @@ class model():
             self.LineTypes[0]["length"] = self.depth - 15 # -15 m assuming 15 m design wave heigh, fairleads never cross waterline
 
         else:
-            raise Exception(f"Line shape {self.shape} is not supported")
+            raise Exception(f"Line shape {shape} is not supported")
 
         # Anchor Values
         self.set_nAnchTypes(0)
@@ -642,9 +2620,20 @@ class model():
                 self.nAnchTypes += 1
 
                 self.AnchTypes[-1]["soil_type"] = soil_type
-                self.AnchTypes[-1]["cost"], self.AnchTypes[-1]["mass"], self.AnchTypes[-1]["kind"] = self.backend.getAnchor(self.AnchTypes[-1]["soil_type"], load = self.LineTypes[i]["design_load"], load_dir = self.LineTypes[i]["aLoadDir"])
+                if Load_Table != None:
+                    dirs = [self.LineTypes[i]["aLoadDir"] if d == "none" else d for d in cases["dirs"]]
+                    self.AnchTypes[-1]["cost"], self.AnchTypes[-1]["mass"], self.AnchTypes[-1]["area"], self.AnchTypes[-1]["kind"], k = self.size_anchor_envelope(self.AnchTypes[-1]["soil_type"], cases["loads"], dirs, anchor_select = anchor_select)
+                    self.AnchTypes[-1]["governing"] = cases["names"][k]
+                else:
+                    self.AnchTypes[-1]["cost"], self.AnchTypes[-1]["mass"], self.AnchTypes[-1]["area"], self.AnchTypes[-1]["kind"] = self.size_anchor(self.AnchTypes[-1]["soil_type"], self.LineTypes[i]["design_load"], self.LineTypes[i]["aLoadDir"], anchor_select = anchor_select)
+                self.AnchTypes[-1]["status"] = self.backend.anchor_status()
                 self.AnchTypes[-1]["num"] = self.LineTypes[i]["nAnch"] * self.LineTypes[i]["num"]
         
+            if Load_Table != None:
+                self.LineTypes[i]["governing"] = cases["names"][cases["governing"]]
+                if cases["peak"] != cases["governing"]:
+                    self.LineTypes[i]["governing"] += f" (MBL), {cases['names'][cases['peak']]} (peak tension)"
+
             # Connection values
             self.con_cost += self.backend.getConnect(design_load=self.LineTypes[i]["design_load"]) * self.LineTypes[i]["nCon"]
 
@@ -656,7 +2645,7 @@ class model():
             self.BuoyTypes[i]["buoyancy"] = buoy[1] # kN
             self.BuoyTypes[i]["cost"] = self.backend.getBuoy(self.BuoyTypes[i]["buoyancy"])
 
-    def set_paramsA2(self, Line_Table = None, soil_type = None, depth = None, Buoy_Table = [], inflation_scale = 1):
+    def set_paramsA2(self, Line_Table = None, soil_type = None, depth = None, Buoy_Table = [], inflation_scale = 1, anchor_select = "default"):
         '''Calculates the mooring system parameters, including unit 
         cost, based on a medium level of user inputs (similar to 
         existing MoorPy/MoorDyn inputs). 
@@ -673,19 +2662,17 @@ class model():
             a list of lists containing buoy parameters. Values are: "Num of these buoys", "Buoyancy [kN]"
         inflation_scale : float
             value to scale costs by to account for inflation from 2024$
+        anchor_select : string (optional)
+            "default" picks the anchor type from the load direction, "cheapest" sizes every valid anchor type and keeps the cheapest (see backend.compareAnchors)
         '''
 
-        print(f"INFO: Using MoorDyn level parameters. {len(Line_Table)} different line types")
+        if self.backend.verbose:
+            print(f"INFO: Using MoorDyn level parameters. {len(Line_Table)} different line types")
 
-        # check table lengths
-        if len(Line_Table) > 0:
-            if len(Line_Table[0]) != 8:
-                raise Exception("Line table in A2 must have 8 columns")
-        else:
-            raise Exception("Lines required for A2")
-        if len(Buoy_Table) > 0:
-            if len(Buoy_Table[0]) != 2:
-                raise Exception("Buoy table must have 2 columns")
+        # check every table row before sizing
+        errors = self.validate_tables([{"level" : 2, "Line_Table" : Line_Table, "soil_type" : soil_type, "Buoy_Table" : Buoy_Table}])
+        if len(errors) > 0:
+            raise Exception("Invalid A2 inputs:\n    " + "\n    ".join(errors[0]))
 
         # system values
         self.depth = depth # unused
@@ -721,7 +2708,8 @@ class model():
                 self.nAnchTypes += 1
 
                 self.AnchTypes[-1]["soil_type"] = soil_type
-                self.AnchTypes[-1]["cost"], self.AnchTypes[-1]["mass"], self.AnchTypes[-1]["kind"] = self.backend.getAnchor(self.AnchTypes[-1]["soil_type"], load = self.LineTypes[i]["design_load"], load_dir = self.LineTypes[i]["aLoadDir"])
+                self.AnchTypes[-1]["cost"], self.AnchTypes[-1]["mass"], self.AnchTypes[-1]["area"], self.AnchTypes[-1]["kind"] = self.size_anchor(self.AnchTypes[-1]["soil_type"], self.LineTypes[i]["design_load"], self.LineTypes[i]["aLoadDir"], anchor_select = anchor_select)
+                self.AnchTypes[-1]["status"] = self.backend.anchor_status()
                 self.AnchTypes[-1]["num"] = self.LineTypes[i]["nAnch"] * self.LineTypes[i]["num"]
         
             # Connection values
@@ -753,18 +2741,13 @@ class model():
             value to scale costs by to account for inflation from 2024$
         '''       
 
-        print("INFO: Using full user provided parameters")
+        if self.backend.verbose:
+            print("INFO: Using full user provided parameters")
 
-        # check table lengths
-        if len(Line_Table) > 0:
-            if len(Line_Table[0]) != 6:
-                raise Exception("Line table in A3 must have 6 columns")
-        if len(Anchor_Table) > 0:
-            if len(Anchor_Table[0]) != 5:
-                raise Exception("Anchor table in A3 must have 5 columns")
-        if len(Buoy_Table) > 0:
-            if len(Buoy_Table[0]) != 2:
-                raise Exception("Buoy table must have 2 columns")
+        # check every table row before sizing
+        errors = self.validate_tables([{"level" : 3, "Line_Table" : Line_Table, "Anchor_Table" : Anchor_Table, "depth" : depth, "Buoy_Table" : Buoy_Table}])
+        if len(errors) > 0:
+            raise Exception("Invalid A3 inputs:\n    " + "\n    ".join(errors[0]))
 
         # system values
         self.depth = depth
@@ -807,13 +2790,1052 @@ class model():
             self.BuoyTypes[i]["buoyancy"]= buoy[1] # kN
             self.BuoyTypes[i]["cost"] = self.backend.getBuoy(self.BuoyTypes[i]["buoyancy"])
 
+    # ---------- Batch interface ----------
+
+    def validate_tables(self, cases):
+        '''Checks every row of the Line, Anchor and Buoy tables of a batch of cases before any sizing. Rows of 
+        all cases are checked together, one column at a time: row lengths, keywords (material, load direction, 
+        anchor type, soil type), ranges and counts (see model.table_columns), anchors with no load direction, 
+        and line diameters outside the lineProps MBL curve limits (MBL_dmin, MBL_dmax) of the loaded database.
+        
+        Parameters
+        ----------
+        cases : list
+            case dictionaries (see run_case)
+        
+        Returns
+        -------
+        dictionary
+            lists of error messages keyed by case index. Empty if every case is valid
+        '''
+        errors = {}
+        def add(k, message):
+            errors.setdefault(int(k), []).append(message)
+
+        def numbers(values):
+            try:
+                return np.asarray(values, dtype=float)
+            except (TypeError, ValueError):
+                out = np.full(len(values), np.nan)
+                for i, value in enumerate(values):
+                    try:
+                        out[i] = float(value)
+                    except (TypeError, ValueError):
+                        pass
+                return out
+
+        # gather the rows of each table by level
+        groups = {}
+        for k, case in enumerate(cases):
+            level = case.get("level", 1)
+            if level == 2:
+                if case.get("Line_Table") == None or len(case["Line_Table"]) == 0:
+                    add(k, "Lines required for A2")
+                if case.get("soil_type") not in SOILS and any(len(row) == 8 and numbers([row[6]])[0] > 0 for row in case.get("Line_Table") or []):
+                    add(k, f"Soil type '{case.get('soil_type')}' is not one of {SOILS}")
+            if level in (1, 3) and case.get("depth") != None and not numbers([case["depth"]])[0] > 0:
+                add(k, f"Depth must be greater than zero, not {case['depth']}")
+            for table, levels in model.table_columns.items():
+                if level not in levels or case.get(table) == None:
+                    continue
+                for r, row in enumerate(case[table]):
+                    if len(row) != len(levels[level]):
+                        add(k, f"{table} row {r+1}: {len(row)} columns, A{level} needs {len(levels[level])}")
+                    else:
+                        groups.setdefault((table, level), []).append((k, r, row))
+
+        for (table, level), rows in groups.items():
+            ks = np.array([row[0] for row in rows])
+            rs = np.array([row[1] for row in rows])
+            cols = list(zip(*[row[2] for row in rows]))
+            values = {}
+            for (name, check), col in zip(model.table_columns[table][level], cols):
+                if isinstance(check, tuple):
+                    x = np.asarray([str(v) for v in col])
+                    bad = ~np.isin(x, check)
+                    for i in np.flatnonzero(bad):
+                        add(ks[i], f"{table} row {rs[i]+1}: {name} '{col[i]}' is not one of {check}")
+                else:
+                    x = numbers(col)
+                    with np.errstate(invalid = "ignore"):
+                        if check == "positive":
+                            bad = ~(x > 0)
+                        else:
+                            bad = ~(x >= 0)
+                        if check == "count":
+                            bad |= x != np.round(x)
+                    limit = {"positive" : "greater than zero", "nonnegative" : "zero or more", "count" : "a whole number, zero or more"}[check]
+                    for i in np.flatnonzero(bad):
+                        add(ks[i], f"{table} row {rs[i]+1}: {name} must be {limit}, not {col[i]}")
+                values[name] = x
+
+            if table == "Line_Table":
+                if level == 2:
+                    bad = (values["Number of anchors"] > 0) & (values["Anchor load direction"] == "none")
+                    for i in np.flatnonzero(bad):
+                        add(ks[i], f"{table} row {rs[i]+1}: Anchor direction cannot be 'none' if nAnch is greater than zero")
+
+                lineProps = getattr(self.backend, "lineProps", None)
+                if lineProps != None:
+                    material = values["Line material"]
+                    missing = np.isin(material, MATERIALS) & ~np.isin(material, list(lineProps))
+                    for i in np.flatnonzero(missing):
+                        add(ks[i], f"{table} row {rs[i]+1}: Line material '{material[i]}' is not in the loaded lineProps")
+                    known = [m for m in MATERIALS if m in lineProps]
+                    dmin = np.array([float(lineProps[m].get("MBL_dmin", -1)) if m in known else -1.0 for m in material])
+                    dmax = np.array([float(lineProps[m].get("MBL_dmax", -1)) if m in known else -1.0 for m in material])
+                    d = values["Diameter"]
+                    with np.errstate(invalid = "ignore"):
+                        bad = ((dmin >= 0) & (d < dmin)) | ((dmax >= 0) & (d > dmax))
+                    for i in np.flatnonzero(bad):
+                        add(ks[i], f"{table} row {rs[i]+1}: Diameter {d[i]} m is outside the MBL curve range {dmin[i]} - {dmax[i]} m for '{material[i]}'")
+
+        return dict(sorted(errors.items()))
+
+    def filter_cases(self, cases):
+        '''Splits a batch into valid and invalid cases with validate_tables, so invalid cases are never sized
+        
+        Parameters
+        ----------
+        cases : list
+            case dictionaries (see run_case)
+        
+        Returns
+        -------
+        valid : list
+            indices of the valid cases
+        errors : dictionary
+            lists of error messages keyed by the indices of the invalid cases
+        '''
+        errors = self.validate_tables(cases)
+        if self.backend.verbose and len(errors) > 0:
+            print(f"WARNING: {len(errors)} of {len(cases)} cases have invalid tables")
+        return [k for k in range(len(cases)) if k not in errors], errors
+
+    def run_case(self, case):
+        '''Runs a single case through set_params# and calc_cost without the printed report
+        
+        Parameters
+        ----------
+        case : dictionary
+            "level" (0, 1, 2 or 3) plus the keyword arguments of the matching set_params function
+        
+        Returns
+        -------
+        array
+            the system costs in the order of COST_COLUMNS [2024$ scaled by inflation_scale]
+        '''
+        kwargs = dict(case)
+        level = kwargs.pop("level", 1)
+        if level == 0:
+            self.set_paramsA0()
+        elif level == 1:
+            self.set_paramsA1(**kwargs)
+        elif level == 2:
+            self.set_paramsA2(**kwargs)
+        elif level == 3:
+            self.set_paramsA3(**kwargs)
+        else:
+            raise Exception(f"Assumption level {level} is not supported")
+
+        costs = self.calc_cost(report = False)
+        return np.array([costs[key] for key in COST_COLUMNS], dtype = float)
+
+    def buffer_out(self, n, out):
+        '''returns a float64 (n, 5) view of out, or a new array if out is None'''
+        if out is None:
+            return np.full([n, len(COST_COLUMNS)], np.nan)
+        view = np.asarray(out)
+        if view.dtype != np.float64 or not view.flags.c_contiguous or not view.flags.writeable or view.size != n * len(COST_COLUMNS):
+            raise Exception(f"out must be a writable C contiguous float64 buffer with {n * len(COST_COLUMNS)} elements")
+        view = view.reshape([n, len(COST_COLUMNS)])
+        view[:] = np.nan
+        return view
+
+    def buffer_in(self, buf, ncols, name):
+        '''returns a float64 (rows, ncols) view of an input buffer, copying only if it is not float64 C contiguous'''
+        view = np.ascontiguousarray(np.asarray(buf, dtype = np.float64))
+        if view.size % ncols != 0:
+            raise Exception(f"{name} buffer must have {ncols} columns")
+        return view.reshape([-1, ncols])
+
+    def buffer_code(self, code, keys, name):
+        '''returns the keyword for an integer code read from a buffer, rejecting codes that are not integral or outside 0 <= code < len(keys)'''
+        if not (code == int(code) and 0 <= code < len(keys)):
+            raise Exception(f"invalid {name} code {code}, expected an integer from 0 to {len(keys) - 1}")
+        return keys[int(code)]
+
+    def buffer_ends(self, counts, name):
+        '''returns the end row of each case from a column of row counts, rejecting counts that are negative or not integral'''
+        bad = np.flatnonzero(~((counts >= 0) & (counts == np.floor(counts))))
+        if len(bad) > 0:
+            raise Exception(f"cases {bad.tolist()} have invalid {name} row counts {counts[bad].tolist()}, expected integers of 0 or more")
+        return np.cumsum(counts.astype(int))
+
+    def run_bufferA1(self, cases, out = None):
+        '''Runs a batch of A1 cases from a flat buffer. Anything supporting the buffer protocol 
+        (NumPy arrays, array.array, memoryview of a C array) is read without copying if it holds 
+        C contiguous float64 values. Cases that fail leave NaN in their output row.
+        
+        Layout
+        ------
+        cases : float64, n rows x 4 columns
+            shape code (index in SHAPES), depth [m], design load [kN], soil code (index in SOILS)
+        out : float64, n rows x 5 columns
+            costs in the order of COST_COLUMNS [2024$ scaled by inflation_scale]
+        
+        Parameters
+        ----------
+        cases : buffer
+            the case buffer
+        out : buffer (optional)
+            output buffer written in place. A new array is made if not given
+        
+        Returns
+        -------
+        array
+            the (n, 5) output array (a view of out if given)
+        '''
+        cases = self.buffer_in(cases, 4, "cases")
+        out = self.buffer_out(len(cases), out)
+        for i, (shape, depth, design_load, soil) in enumerate(cases):
+            try:
+                out[i] = self.run_case({"level" : 1, "shape" : self.buffer_code(shape, SHAPES, "shape"), "depth" : depth, "design_load" : design_load, "soil_type" : self.buffer_code(soil, SOILS, "soil")})
+            except Exception as e:
+                if self.backend.verbose:
+                    print(f"WARNING: A1 case {i} failed: {e}")
+        return out
+
+    def run_bufferA2(self, cases, lines, out = None):
+        '''Runs a batch of A2 cases from flat buffers. Line rows are stored back to back, 
+        case i using the next "number of line rows" rows after those of case i-1. 
+        See run_bufferA1 for buffer handling.
+        
+        Layout
+        ------
+        cases : float64, n rows x 3 columns
+            depth [m], soil code (index in SOILS), number of line rows
+        lines : float64, m rows x 8 columns
+            num of these lines, material code (index in MATERIALS), diameter [m], factor of safety, 
+            length [m], anchor load direction code (index in LOAD_DIRS), number of anchors per line, num connections per line
+        out : float64, n rows x 5 columns
+            costs in the order of COST_COLUMNS [2024$ scaled by inflation_scale]
+        
+        Parameters
+        ----------
+        cases : buffer
+            the case buffer
+        lines : buffer
+            the line row buffer
+        out : buffer (optional)
+            output buffer written in place. A new array is made if not given
+        
+        Returns
+        -------
+        array
+            the (n, 5) output array (a view of out if given)
+        '''
+        cases = self.buffer_in(cases, 3, "cases")
+        lines = self.buffer_in(lines, 8, "lines")
+        ends = self.buffer_ends(cases[:, 2], "line")
+        if len(ends) > 0 and ends[-1] != len(lines):
+            raise Exception(f"cases reference {ends[-1]} line rows but {len(lines)} were given")
+        out = self.buffer_out(len(cases), out)
+        start = 0
+        for i, (depth, soil, nrows) in enumerate(cases):
+            rows = lines[start:ends[i]]
+            start = ends[i]
+            try:
+                table = [[int(r[0]), self.buffer_code(r[1], MATERIALS, "material"), r[2], r[3], r[4], self.buffer_code(r[5], LOAD_DIRS, "load direction"), int(r[6]), int(r[7])] for r in rows]
+                out[i] = self.run_case({"level" : 2, "Line_Table" : table, "soil_type" : self.buffer_code(soil, SOILS, "soil"), "depth" : depth})
+            except Exception as e:
+                if self.backend.verbose:
+                    print(f"WARNING: A2 case {i} failed: {e}")
+        return out
+
+    def run_bufferA3(self, cases, lines, anchors, out = None):
+        '''Runs a batch of A3 cases from flat buffers. Line and anchor rows are stored back 
+        to back as in run_bufferA2. See run_bufferA1 for buffer handling.
+        
+        Layout
+        ------
+        cases : float64, n rows x 3 columns
+            depth [m], number of line rows, number of anchor rows
+        lines : float64, m rows x 6 columns
+            num of these lines, material code (index in MATERIALS), diameter [m], factor of safety, length [m], num connections per line
+        anchors : float64, k rows x 5 columns
+            num of these anchors, anchor type code (index in ANCHORS), mass [kg], area [m^2], soil code (index in SOILS)
+        out : float64, n rows x 5 columns
+            costs in the order of COST_COLUMNS [2024$ scaled by inflation_scale]
+        
+        Parameters
+        ----------
+        cases : buffer
+            the case buffer
+        lines : buffer
+            the line row buffer
+        anchors : buffer
+            the anchor row buffer
+        out : buffer (optional)
+            output buffer written in place. A new array is made if not given
+        
+        Returns
+        -------
+        array
+            the (n, 5) output array (a view of out if given)
+        '''
+        cases = self.buffer_in(cases, 3, "cases")
+        lines = self.buffer_in(lines, 6, "lines")
+        anchors = self.buffer_in(anchors, 5, "anchors")
+        line_ends = self.buffer_ends(cases[:, 1], "line")
+        anchor_ends = self.buffer_ends(cases[:, 2], "anchor")
+        if len(cases) > 0 and (line_ends[-1] != len(lines) or anchor_ends[-1] != len(anchors)):
+            raise Exception("Number of line or anchor rows referenced by cases does not match the buffers")
+        out = self.buffer_out(len(cases), out)
+        line_start = 0
+        anchor_start = 0
+        for i, (depth, nlines, nanchors) in enumerate(cases):
+            lrows = lines[line_start:line_ends[i]]
+            arows = anchors[anchor_start:anchor_ends[i]]
+            line_start = line_ends[i]
+            anchor_start = anchor_ends[i]
+            try:
+                line_table = [[int(r[0]), self.buffer_code(r[1], MATERIALS, "material"), r[2], r[3], r[4], int(r[5])] for r in lrows]
+                anchor_table = [[int(r[0]), self.buffer_code(r[1], ANCHORS, "anchor"), r[2], r[3], self.buffer_code(r[4], SOILS, "soil")] for r in arows]
+                out[i] = self.run_case({"level" : 3, "Line_Table" : line_table, "Anchor_Table" : anchor_table, "depth" : depth})
+            except Exception as e:
+                if self.backend.verbose:
+                    print(f"WARNING: A3 case {i} failed: {e}")
+        return out
+
+    def run_batch(self, cases):
+        '''Runs a batch of cases. Repeated cases are only run once, and A1 cases are answered 
+        from the response surface in one vectorized query when a surface is loaded. Cases with 
+        invalid tables (see validate_tables) and failed cases are NaN.
+        
+        Parameters
+        ----------
+        cases : list
+            case dictionaries (see run_case)
+        
+        Returns
+        -------
+        array
+            (n, 5) costs in the order of COST_COLUMNS
+        '''
+        costs = np.full([len(cases), len(COST_COLUMNS)], np.nan)
+
+        # cases with invalid tables are left as NaN without sizing
+        invalid = self.validate_tables(cases)
+        if self.backend.verbose:
+            for k, messages in invalid.items():
+                print(f"WARNING: case {k} skipped: {'; '.join(messages)}")
+
+        # group repeated cases
+        unique = {}
+        for k, case in enumerate(cases):
+            if k not in invalid:
+                unique.setdefault(json.dumps(case, sort_keys = True, default = str), []).append(k)
+
+        todo = []
+        if self.surface != None:
+            keys = [key for key, ks in unique.items() if cases[ks[0]].get("level", 1) == 1 and cases[ks[0]].get("Load_Table") == None and len(cases[ks[0]].get("Buoy_Table", [])) == 0 and cases[ks[0]].get("inflation_scale", 1) == 1 and cases[ks[0]].get("anchor_select", "default") == "default"]
+            if len(keys) > 0:
+                first = [cases[unique[key][0]] for key in keys]
+                try:
+                    found = self.query_A1([case.get("shape", "catenary") for case in first], [case["depth"] for case in first], [case["design_load"] for case in first], [case.get("soil_type", "sand") for case in first])[0]
+                    for key, row in zip(keys, found):
+                        costs[unique[key]] = row
+                except Exception:
+                    todo += keys # fall back to running them one at a time
+            todo += [key for key in unique if key not in keys]
+        else:
+            todo = list(unique)
+
+        for key in todo:
+            try:
+                costs[unique[key]] = self.run_case(cases[unique[key][0]])
+            except Exception as e:
+                if self.backend.verbose:
+                    print(f"WARNING: case failed: {e}")
+
+        return costs
+
+    def iter_costs(self, cases, batch_size = 64, workers = 0, max_in_flight = 2):
+        '''Lazily evaluates a stream of cases. Cases are pulled from the iterable a batch at a 
+        time and run with run_batch, and results are yielded in input order. With workers, up to 
+        max_in_flight batches run ahead of the consumer in a thread pool. No more cases are pulled 
+        until the consumer takes results, so memory stays bounded for slow consumers.
+        
+        Parameters
+        ----------
+        cases : iterable
+            case dictionaries (see run_case), e.g. from a generator
+        batch_size : int (optional)
+            cases evaluated together
+        workers : int (optional)
+            worker threads. 0 runs batches in the calling thread
+        max_in_flight : int (optional)
+            batches submitted ahead of the consumer when using workers
+        
+        Yields
+        ------
+        case : dictionary
+            the case
+        costs : array
+            its costs in the order of COST_COLUMNS (NaN if it failed)
+        '''
+        cases = iter(cases)
+
+        def next_batch():
+            return list(itertools.islice(cases, batch_size))
+
+        if workers <= 0:
+            while True:
+                batch = next_batch()
+                if len(batch) == 0:
+                    return
+                for case, costs in zip(batch, self.run_batch(batch)):
+                    yield case, costs
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers = workers) as pool:
+            pending = [] # (batch, future) in submission order
+            try:
+                while True:
+                    while len(pending) < max(1, max_in_flight):
+                        batch = next_batch()
+                        if len(batch) == 0:
+                            break
+                        pending.append((batch, pool.submit(self.run_batch, batch)))
+                    if len(pending) == 0:
+                        return
+                    batch, future = pending.pop(0)
+                    for case, costs in zip(batch, future.result()):
+                        yield case, costs
+            finally:
+                for batch, future in pending: # consumer stopped early
+                    future.cancel()
+
+    def line_table_from_A1(self):
+        '''Derives an A2 Line_Table from the system set by set_paramsA1 in this thread
+        
+        Returns
+        -------
+        list
+            a list of lists, one for each line type. Values are: "Num of these lines", "Line material", "Diameter [m]", "Factor of safety", 
+            "Length [m]", "Load Direction", "Number of anchors for line", "Num connections per line"
+        '''
+        return [[lType["num"], lType["MP_data"]["material"], float(lType["MP_data"]["input_d"]), lType["FOS"], float(lType["length"]), 
+                 lType["aLoadDir"], lType["nAnch"], lType["nCon"]] for lType in self.LineTypes]
+
+    def screen_cascade(self, cases, top_k = None, margin = None, refine = None):
+        '''Screens candidates at A1 fidelity and refines the best at A2 fidelity. All cases are 
+        run with run_batch (so a loaded response surface is used) and ranked by total cost. The top_k 
+        cheapest, and/or those within margin of the cheapest, are rerun at A1 to get their line types, 
+        which become an A2 Line_Table (optionally edited by refine) that is run with set_paramsA2.
+        
+        Parameters
+        ----------
+        cases : list
+            A1 case dictionaries (keyword arguments of set_paramsA1)
+        top_k : int (optional)
+            number of cheapest candidates to refine
+        margin : float (optional)
+            refine candidates with total cost within this fraction of the cheapest (e.g. 0.05 for 5%)
+        refine : function (optional)
+            refine(case, Line_Table) returns the Line_Table to use at A2, e.g. with measured lengths
+        
+        Returns
+        -------
+        dictionary
+            keys: "A1" (n, 5) A1 costs, "rank" (case indices from cheapest, failed cases last), "refined" (refined case indices), 
+            "A2" (n, 5) A2 costs (NaN where not refined), "tables" (Line_Table used for each refined case)
+        '''
+        if top_k == None and margin == None:
+            raise Exception("Either top_k or margin is needed to pick candidates for refinement")
+
+        a1_cases = [dict(case, level = 1) for case in cases]
+        a1 = self.run_batch(a1_cases)
+        total = np.where(np.isnan(a1[:, -1]), np.inf, a1[:, -1])
+        rank = np.argsort(total, kind = "stable")
+
+        pick = np.zeros(len(cases), dtype=bool)
+        if top_k != None:
+            pick[rank[:top_k]] = True
+        if margin != None and np.isfinite(total[rank[0]]):
+            pick |= total <= total[rank[0]] * (1 + margin)
+        pick &= np.isfinite(total)
+        refined = [int(k) for k in rank if pick[k]]
+
+        a2 = np.full([len(cases), len(COST_COLUMNS)], np.nan)
+        tables = {}
+        for k in refined:
+            case = a1_cases[k]
+            try:
+                self.run_case(case)
+                table = self.line_table_from_A1()
+                if refine != None:
+                    table = refine(cases[k], table)
+                tables[k] = table
+                a2[k] = self.run_case({"level" : 2, "Line_Table" : table, "soil_type" : case.get("soil_type", "sand"), "depth" : case["depth"], 
+                                       "Buoy_Table" : case.get("Buoy_Table", []), "inflation_scale" : case.get("inflation_scale", 1), 
+                                       "anchor_select" : case.get("anchor_select", "default")})
+            except Exception as e:
+                if self.backend.verbose:
+                    print(f"WARNING: refinement of case {k} failed: {e}")
+
+        if self.backend.verbose:
+            print(f"INFO: screened {len(cases)} cases at A1, refined {len(refined)} at A2")
+
+        return {"A1" : a1, "rank" : rank, "refined" : refined, "A2" : a2, "tables" : tables}
+
+    def inverse_A1(self, budget, variable = "design_load", shape = "catenary", depth = None, design_load = None, soil_type = "sand", component = "total", 
+                   lo = None, hi = None, limit = None, rtol = 1e-3, max_iter = 60):
+        '''Finds, for each site, the largest design load (or depth) whose A1 cost is within a budget. 
+        All sites are bracketed (doubling the upper bound) and then bisected together, one run_batch 
+        per step. Every step tries new values, so the exact sizing caches are not reused; build a response 
+        surface (build_surface) covering the search range to answer the steps from it instead. Cost is 
+        assumed to increase with the searched variable.
+        
+        Parameters
+        ----------
+        budget : float, array or dictionary
+            cost budget per device [2024$]. A dictionary gives budgets per component, e.g. {"anchor" : 1e5, "total" : 5e5}
+        variable : string (optional)
+            the variable to maximize: design_load or depth
+        shape : string or list (optional)
+            the shape of the mooring lines. Options are: catenary, semi-taut, taut, tension
+        depth : float or array
+            the water depth [m] (starting lower bound if variable is depth)
+        design_load : float or array
+            the design load [kN] (starting lower bound if variable is design_load)
+        soil_type : string or list (optional)
+            the type of soil. Options are: soft clay, medium clay, hard clay, sand
+        component : string (optional)
+            the cost component the budget applies to if budget is not a dictionary. Options are in COST_COLUMNS
+        lo : float or array (optional)
+            lower bound of the search. Defaults to the given depth or design load, or 1
+        hi : float or array (optional)
+            first upper bound tried. Defaults to twice lo
+        limit : float (optional)
+            largest value searched. Defaults to 1e5 kN or 1e4 m
+        rtol : float (optional)
+            relative tolerance on the result
+        max_iter : int (optional)
+            maximum bisection steps
+        
+        Returns
+        -------
+        dictionary
+            keys: "value" (the largest affordable value per site, NaN if even lo is over budget), 
+            "costs" ((n, 5) costs at value), "at_limit" (True where the budget was not reached below limit)
+        '''
+        if variable not in ("design_load", "depth"):
+            raise Exception(f"Inverse variable '{variable}' is not supported. Options are: design_load, depth")
+        budgets = budget if isinstance(budget, dict) else {component : budget}
+        for key in budgets:
+            if key not in COST_COLUMNS:
+                raise Exception(f"Cost component '{key}' is not supported. Options are: {COST_COLUMNS}")
+
+        start = design_load if variable == "design_load" else depth
+        if lo is None:
+            lo = start if start is not None else 1.0
+        if limit is None:
+            limit = 1e5 if variable == "design_load" else 1e4
+
+        fixed = depth if variable == "design_load" else design_load
+        if fixed is None:
+            raise Exception(f"{'depth' if variable == 'design_load' else 'design_load'} is needed for the inverse solve")
+
+        arrays = np.broadcast_arrays(np.asarray(shape), np.asarray(soil_type), np.asarray(fixed, dtype=float), np.asarray(lo, dtype=float), *[np.asarray(b, dtype=float) for b in budgets.values()])
+        shape, soil_type, fixed, lo = [a.ravel() for a in arrays[:4]]
+        limits = {key : a.ravel().copy() for key, a in zip(budgets, arrays[4:])}
+        lo = lo.copy()
+        n = len(lo)
+        hi = np.minimum(2 * lo if hi is None else np.broadcast_to(np.asarray(hi, dtype=float), n).copy(), limit)
+
+        other = "depth" if variable == "design_load" else "design_load"
+
+        def cases(values, sites):
+            return [{"level" : 1, "shape" : str(shape[k]), "soil_type" : str(soil_type[k]), other : fixed[k], variable : values[k]} for k in sites]
+
+        def evaluate(values, sites):
+            costs = np.full([n, len(COST_COLUMNS)], np.nan)
+            if len(sites) > 0:
+                costs[sites] = self.run_batch(cases(values, sites))
+            ok = np.ones(n, dtype=bool)
+            for key, b in limits.items():
+                c = costs[:, COST_COLUMNS.index(key)]
+                ok &= ~np.isnan(c) & (c <= b)
+            return ok, costs
+
+        sites = np.arange(n)
+        ok_lo, costs_lo = evaluate(lo, sites)
+        value = np.where(ok_lo, lo, np.nan)
+        best = costs_lo.copy()
+
+        # bracket: double hi until it is over budget or at the limit
+        active = ok_lo.copy()
+        at_limit = np.zeros(n, dtype=bool)
+        while np.any(active):
+            ok_hi, costs_hi = evaluate(hi, np.flatnonzero(active))
+            grow = active & ok_hi
+            lo[grow] = hi[grow]
+            best[grow] = costs_hi[grow]
+            at_limit |= grow & (hi >= limit)
+            active = grow & (hi < limit)
+            hi[active] = np.minimum(2 * hi[active], limit)
+
+        # bisect between the affordable lo and the over budget hi
+        active = ok_lo & ~at_limit
+        for _ in range(max_iter):
+            active &= (hi - lo) > rtol * hi
+            if not np.any(active):
+                break
+            mid = 0.5 * (lo + hi)
+            ok_mid, costs_mid = evaluate(mid, np.flatnonzero(active))
+            up = active & ok_mid
+            down = active & ~ok_mid
+            lo[up] = mid[up]
+            best[up] = costs_mid[up]
+            hi[down] = mid[down]
+
+        value = np.where(ok_lo, lo, np.nan)
+        best[~ok_lo] = np.nan
+        if self.backend.verbose and np.any(at_limit):
+            print(f"WARNING: {np.sum(at_limit)} sites are within budget at the search limit of {limit}")
+
+        return {"value" : value, "costs" : best, "at_limit" : at_limit}
+
+    def verify_A1(self, cases, offset = None, load = None, span = None, workers = None, executor = None, chunk_size = 16):
+        '''Checks A1 designs with a static equilibrium solve of the full MoorPy system. Each case is sized 
+        with set_paramsA1, its System is built from the line types (see mooring_system) and solved at an 
+        offset or under a horizontal load, and the peak line tension is compared with the design load. 
+        Designs are sorted by shape, depth and design load so each solve is warm started from a similar 
+        one, and the sorted designs are split into chunks that run in a worker pool.
+        
+        Parameters
+        ----------
+        cases : list
+            A1 case dictionaries (keyword arguments of set_paramsA1)
+        offset : float or array (optional)
+            surge offset of the platform for each case [m]
+        load : float or array (optional)
+            horizontal load on the platform for each case [kN]
+        span : float (optional)
+            fairlead to anchor distance over line length. Defaults to SPANS for the shape
+        workers : int (optional)
+            number of worker processes if no executor is given. 0 solves in this thread
+        executor : concurrent.futures.Executor (optional)
+            an existing pool to run the chunks on
+        chunk_size : int (optional)
+            designs solved in order by one worker
+        
+        Returns
+        -------
+        dictionary
+            keys: "tension" (peak line tension [kN]), "design_load" [kN], "ratio" (tension / design load), "offset" [m], 
+            "converged" (arrays in the order of cases), "errors" (case index : message)
+        '''
+        if (offset is None) == (load is None):
+            raise Exception("Either offset or load is needed to verify A1 designs")
+        n = len(cases)
+        offsets = np.broadcast_to(np.asarray(offset if offset is not None else 0.0, dtype=float), n)
+        loads = np.broadcast_to(np.asarray(load if load is not None else 0.0, dtype=float), n)
+
+        out = {"tension" : np.full(n, np.nan), "design_load" : np.full(n, np.nan), "ratio" : np.full(n, np.nan), 
+               "offset" : np.full(n, np.nan), "converged" : np.zeros(n, dtype=bool), "errors" : {}}
+
+        designs = {}
+        for k, case in enumerate(cases):
+            try:
+                self.set_paramsA1(**{key : value for key, value in case.items() if key != "level"})
+                designs[k] = {"shape" : self.LineTypes[0]["shape"], "depth" : self.depth, "fairlead_z" : -15.0 if self.LineTypes[0]["shape"] == "tension" else 0.0, 
+                              "lines" : [{"num" : lType["num"], "MP_data" : lType["MP_data"], "length" : float(lType["length"])} for lType in self.LineTypes]}
+                out["design_load"][k] = self.LineTypes[0]["design_load"]
+            except Exception as e:
+                out["errors"][k] = str(e)
+
+        order = sorted(designs, key = lambda k : (designs[k]["shape"], designs[k]["depth"], out["design_load"][k]))
+        chunks = [order[i:i + chunk_size] for i in range(0, len(order), chunk_size)]
+
+        def args(chunk):
+            return ([designs[k] for k in chunk], offsets[chunk] if offset is not None else None, loads[chunk] if load is not None else None, span)
+
+        if workers == 0 and executor == None:
+            solved = [mooring_equilibrium(*args(chunk)) for chunk in chunks]
+        else:
+            pool = executor if executor != None else concurrent.futures.ProcessPoolExecutor(max_workers = workers)
+            try:
+                futures = [pool.submit(mooring_equilibrium, *args(chunk)) for chunk in chunks]
+                solved = [future.result() for future in futures]
+            finally:
+                if executor == None:
+                    pool.shutdown()
+
+        for chunk, results in zip(chunks, solved):
+            for k, result in zip(chunk, results):
+                out["tension"][k] = result["tension"]
+                out["offset"][k] = result["offset"]
+                out["converged"][k] = result["converged"]
+                if "error" in result:
+                    out["errors"][k] = result["error"]
+        out["ratio"] = out["tension"] / out["design_load"]
+
+        if self.backend.verbose:
+            over = np.sum(out["ratio"] > 1)
+            if over > 0:
+                print(f"WARNING: peak tension exceeds the design load in {over} of {n} A1 designs")
+            if len(out["errors"]) > 0:
+                print(f"WARNING: {len(out['errors'])} A1 designs could not be verified")
+
+        return out
+
+    def sweep(self, cases, path, batch_size = 1000):
+        '''Runs a list of cases and writes the costs to a results_store as each batch finishes. 
+        Rerunning with the same cases and path resumes, skipping cases that already have results. 
+        Failed cases are stored as NaN. If the sweep is interrupted the finished part of the current 
+        batch is still written.
+        
+        Parameters
+        ----------
+        cases : list
+            case dictionaries (see run_case)
+        path : string
+            results store directory
+        batch_size : int (optional)
+            cases per shard
+        
+        Returns
+        -------
+        results_store
+            the store. Use results() or open_shards() to read it
+        '''
+        store = results_store(path)
+        done = store.completed(len(cases))
+        if self.backend.verbose and np.any(done):
+            print(f"INFO: resuming sweep, {np.sum(done)} of {len(cases)} cases already done")
+
+        indices = []
+        rows = []
+        try:
+            for i, case in enumerate(cases):
+                if done[i]:
+                    continue
+                try:
+                    rows.append(self.run_case(case))
+                except Exception as e:
+                    if self.backend.verbose:
+                        print(f"WARNING: case {i} failed: {e}")
+                    rows.append(np.full(len(COST_COLUMNS), np.nan))
+                indices.append(i)
+
+                if len(indices) == batch_size:
+                    store.write(indices, rows)
+                    indices = []
+                    rows = []
+        finally:
+            store.write(indices, rows) # checkpoint whatever finished, including on Ctrl-C
+
+        return store
+
+    def serve_queue(self, path, lease_time = 600.0, batch_size = 64, poll = 1.0, wait = True):
+        '''Runs as a worker on a work_queue: claims shards, runs them with run_batch and writes the costs back, 
+        renewing the lease after every batch. Load the database (and any catalogs, surrogates or surface) 
+        before serving so every shard reuses it. Expired leases of lost workers are requeued while serving.
+        
+        Parameters
+        ----------
+        path : string
+            the work queue directory
+        lease_time : float (optional)
+            seconds without a renewal before a leased shard is given to another worker
+        batch_size : int (optional)
+            cases run between lease renewals
+        poll : float (optional)
+            seconds between checks for work when nothing is pending
+        wait : bool (optional)
+            keep polling until every shard is done (so shards of lost workers are picked up), 
+            otherwise return when nothing is pending
+        
+        Returns
+        -------
+        int
+            number of shards this worker completed
+        '''
+        queue = work_queue(path, lease_time = lease_time, verbose = self.backend.verbose)
+        n_done = 0
+        while True:
+            queue.requeue_expired()
+            name, shard = queue.claim()
+            if name == None:
+                if wait and not queue.finished():
+                    time.sleep(poll)
+                    continue
+                return n_done
+
+            cases = shard["cases"]
+            rows = []
+            for i in range(0, len(cases), batch_size):
+                rows.append(self.run_batch(cases[i:i + batch_size]))
+                if not queue.renew(name) and self.backend.verbose:
+                    print(f"WARNING: lease on {name} expired, it may be run again by another worker")
+            queue.complete(name, shard["start"], np.concatenate(rows) if len(rows) > 0 else np.zeros([0, len(COST_COLUMNS)]))
+            n_done += 1
+            if self.backend.verbose:
+                print(f"INFO: worker {os.getpid()} finished {name}")
+
+    # ---------- Response surfaces ----------
+
+    def build_surface(self, path, depths, loads, shapes = SHAPES, soils = SOILS, n_check = 200, seed = 0):
+        '''Precomputes A1 component costs on a (depth x design load) grid for each shape and 
+        soil type, and saves it to a .npz file for query_A1. The interpolation error is measured 
+        by running the full model at n_check random cell centers per shape and soil, and the 
+        largest relative error in total cost is stored as the error bound. Buoys are not 
+        included (they do not depend on depth or design load).
+        
+        Parameters
+        ----------
+        path : string
+            path to the .npz file
+        depths : array
+            grid water depths [m]
+        loads : array
+            grid design loads [kN]
+        shapes : list (optional)
+            mooring shapes to include
+        soils : list (optional)
+            soil types to include
+        n_check : int (optional)
+            number of cell centers checked against the full model per shape and soil
+        seed : int (optional)
+            random seed for picking the checked cells
+        
+        Returns
+        -------
+        dictionary
+            the surface (see load_surface)
+        '''
+        depths = np.unique(np.asarray(depths, dtype=float))
+        loads = np.unique(np.asarray(loads, dtype=float))
+        if len(depths) < 2 or len(loads) < 2:
+            raise Exception("At least two depths and two design loads are needed for a response surface")
+
+        costs = np.full([len(shapes), len(soils), len(depths), len(loads), len(COST_COLUMNS)], np.nan)
+        for s, shape in enumerate(shapes):
+            for o, soil in enumerate(soils):
+                for i, depth in enumerate(depths):
+                    for j, load in enumerate(loads):
+                        try:
+                            costs[s, o, i, j] = self.run_case({"level" : 1, "shape" : shape, "depth" : depth, "design_load" : load, "soil_type" : soil})
+                        except Exception as e:
+                            if self.backend.verbose:
+                                print(f"WARNING: surface point {shape}, {soil}, {depth} m, {load} kN failed: {e}")
+
+        self.surface = {"shapes" : list(shapes), "soils" : list(soils), "depths" : depths, "loads" : loads, "costs" : costs, "error" : np.zeros([len(shapes), len(soils)])}
+
+        # error bound from cell centers
+        rng = np.random.default_rng(seed)
+        n = min(n_check, (len(depths)-1) * (len(loads)-1))
+        for s, shape in enumerate(shapes):
+            for o, soil in enumerate(soils):
+                cells = rng.choice((len(depths)-1) * (len(loads)-1), size = n, replace = False)
+                d = 0.5 * (depths[cells // (len(loads)-1)] + depths[cells // (len(loads)-1) + 1])
+                l = 0.5 * (loads[cells % (len(loads)-1)] + loads[cells % (len(loads)-1) + 1])
+                approx = self.interp_surface(np.full(n, s), np.full(n, o), d, l)[:, -1]
+                error = 0.0
+                for k in range(n):
+                    if np.isnan(approx[k]):
+                        continue
+                    try:
+                        exact = self.run_case({"level" : 1, "shape" : shape, "depth" : d[k], "design_load" : l[k], "soil_type" : soil})[-1]
+                    except Exception:
+                        continue
+                    error = max(error, abs(approx[k] - exact) / exact)
+                self.surface["error"][s, o] = error
+
+        np.savez(path, shapes = np.array(self.surface["shapes"]), soils = np.array(self.surface["soils"]), depths = depths, loads = loads, costs = costs, error = self.surface["error"])
+        return self.surface
+
+    def load_surface(self, path):
+        '''Loads a response surface saved by build_surface
+        
+        Parameters
+        ----------
+        path : string
+            path to the .npz file
+        
+        Returns
+        -------
+        dictionary
+            keys: "shapes", "soils", "depths" [m], "loads" [kN], "costs" (array [shape, soil, depth, load, COST_COLUMNS]), 
+            "error" (max relative total cost error found per shape and soil)
+        '''
+        with np.load(path) as data:
+            self.surface = {"shapes" : [str(x) for x in data["shapes"]], "soils" : [str(x) for x in data["soils"]], "depths" : data["depths"], 
+                            "loads" : data["loads"], "costs" : data["costs"], "error" : data["error"]}
+        return self.surface
+
+    def interp_surface(self, s, o, depth, design_load):
+        '''Bilinear interpolation of the response surface. Points outside the grid are NaN.
+        
+        Parameters
+        ----------
+        s : int array
+            shape indices into the surface
+        o : int array
+            soil indices into the surface
+        depth : array
+            water depths [m]
+        design_load : array
+            design loads [kN]
+        
+        Returns
+        -------
+        array
+            (n, 5) costs in the order of COST_COLUMNS
+        '''
+        D = self.surface["depths"]
+        L = self.surface["loads"]
+        C = self.surface["costs"]
+
+        i = np.clip(np.searchsorted(D, depth) - 1, 0, len(D) - 2)
+        j = np.clip(np.searchsorted(L, design_load) - 1, 0, len(L) - 2)
+        t = ((depth - D[i]) / (D[i+1] - D[i]))[:, None]
+        u = ((design_load - L[j]) / (L[j+1] - L[j]))[:, None]
+
+        costs = (1-t)*(1-u)*C[s, o, i, j] + t*(1-u)*C[s, o, i+1, j] + (1-t)*u*C[s, o, i, j+1] + t*u*C[s, o, i+1, j+1]
+
+        outside = (depth < D[0]) | (depth > D[-1]) | (design_load < L[0]) | (design_load > L[-1])
+        costs[outside] = np.nan
+        return costs
+
+    def query_A1(self, shape, depth, design_load, soil_type = "sand"):
+        '''Answers A1 cost queries from the response surface. Inputs are broadcast against each other. 
+        Points outside the grid, or for shapes and soils not in the surface, fall back to set_paramsA1.
+        
+        Parameters
+        ----------
+        shape : string or list
+            the shape of the mooring lines. Options are: catenary, semi-taut, taut, tension
+        depth : float or array
+            the water depth [m]
+        design_load : float or array
+            the design load of the system [kN]
+        soil_type : string or list (optional)
+            the type of soil. Options are: soft clay, medium clay, hard clay, sand
+        
+        Returns
+        -------
+        costs : array
+            (n, 5) costs in the order of COST_COLUMNS [2024$]
+        error : array
+            the relative error bound for each query (zero where the full model was run)
+        '''
+        if self.surface == None:
+            raise Exception("No response surface loaded. Use build_surface or load_surface first")
+
+        shape, depth, design_load, soil_type = np.broadcast_arrays(np.asarray(shape), np.asarray(depth, dtype=float), np.asarray(design_load, dtype=float), np.asarray(soil_type))
+        shape, depth, design_load, soil_type = shape.ravel(), depth.ravel(), design_load.ravel(), soil_type.ravel()
+
+        s = np.array([self.surface["shapes"].index(x) if x in self.surface["shapes"] else -1 for x in shape], dtype=int)
+        o = np.array([self.surface["soils"].index(x) if x in self.surface["soils"] else -1 for x in soil_type], dtype=int)
+        known = (s >= 0) & (o >= 0)
+
+        costs = np.full([len(depth), len(COST_COLUMNS)], np.nan)
+        error = np.zeros(len(depth))
+        costs[known] = self.interp_surface(s[known], o[known], depth[known], design_load[known])
+        error[known] = self.surface["error"][s[known], o[known]]
+
+        for k in np.where(np.isnan(costs[:, -1]))[0]:
+            costs[k] = self.run_case({"level" : 1, "shape" : str(shape[k]), "depth" : depth[k], "design_load" : design_load[k], "soil_type" : str(soil_type[k])})
+            error[k] = 0.0
+
+        return costs, error
+
     # ---------- Outputs ----------
 
-    def calc_cost(self):
+    def calc_cost_scenarios(self, paths, names = None):
+        '''Prices the system sized by the last set_params call against several cost databases 
+        without re-sizing it. Diameters, lengths, anchor masses and areas, buoyancies and connection 
+        loads are kept, and only the unit costs are looked up in each database. Every component is 
+        priced once per database and the quantities are applied to all scenarios at once. 
+        
+        Parameters
+        ----------
+        paths : list
+            one entry per scenario, each a two element list of lineProps and pointProps yaml paths (None for the MoorPy defaults)
+        names : list (optional)
+            scenario names. Defaults to the scenario index
+        
+        Returns
+        -------
+        dictionary
+            keys: "scenarios" (names), "components" (line, anchor, connection, buoy, total), 
+            "costs" (array of shape [n scenarios, 5], 2024$ scaled by inflation_scale)
+        '''
+        if names == None:
+            names = list(range(len(paths)))
+        elif len(names) != len(paths):
+            raise Exception("Number of scenario names must match the number of database paths")
+
+        # quantities and the component (column) each priced item belongs to
+        qty = []
+        comp = []
+        for lType in self.LineTypes:
+            qty.append(lType["num"] * lType["length"])
+            comp.append(0)
+        for aType in self.AnchTypes:
+            qty.append(aType["num"])
+            comp.append(1)
+        for lType in self.LineTypes:
+            qty.append(lType["nCon"])
+            comp.append(2)
+        for bType in self.BuoyTypes:
+            qty.append(bType["num"])
+            comp.append(3)
+
+        # unit costs, one row per scenario
+        unit = np.zeros([len(paths), len(qty)])
+        for j, path in enumerate(paths):
+            key = None if path == None else tuple(path)
+            if key not in self.scenario_backends:
+                self.scenario_backends[key] = type(self.backend)(verbose = self.backend.verbose)
+                self.scenario_backends[key].load(path)
+            be = self.scenario_backends[key]
+
+            row = []
+            for lType in self.LineTypes:
+                row.append(be.getLine(material = lType["MP_data"]["material"], diam = lType["MP_data"]["input_d"])["cost"])
+            for aType in self.AnchTypes:
+                row.append(be.getAnchor(aType["soil_type"], a_type = aType["kind"], mass = aType["mass"], area = aType["area"] if aType["area"] != None else 0.0)[0])
+            for lType in self.LineTypes:
+                row.append(be.getConnect(lType["design_load"]))
+            for bType in self.BuoyTypes:
+                row.append(be.getBuoy(bType["buoyancy"]))
+            unit[j] = row
+
+        costs = np.zeros([len(paths), 5])
+        np.add.at(costs.T, np.array(comp, dtype=int), (self.inflation_scale * unit * np.array(qty, dtype=float)).T)
+        costs[:, 4] = np.sum(costs[:, :4], axis = 1)
+
+        return {"scenarios" : names, "components" : ("line", "anchor", "connection", "buoy", "total"), "costs" : costs}
+
+    def calc_cost(self, report = True):
         '''Calculates and prints the total cost of the mooring system based on the 
         parameters loaded by the set_params functions. The costs stored in the types 
         are the per unit costs (with the exception of connections), so they are 
         multiplied by the number of each component.
+        
+        Parameters
+        ----------
+        report : bool (optional)
+            print the cost report
+        
+        Returns
+        -------
+        dictionary
+            the system costs [2024$ scaled by inflation_scale] with keys: line, anchor, connection, buoy, total
         '''
         Line_cost = 0
         for lType in self.LineTypes:
@@ -830,6 +3852,10 @@ class model():
             Buoy_cost += self.inflation_scale * bType["num"] * bType["cost"]
 
         Total_cost = Line_cost + Anchor_cost + Connection_cost + Buoy_cost # this is the cost of the mooring system
+        costs = {"line" : Line_cost, "anchor" : Anchor_cost, "connection" : Connection_cost, "buoy" : Buoy_cost, "total" : Total_cost}
+
+        if not report:
+            return costs
 
         print("--------- Cost Report (2024$) ---------")
         print(f"System Parameters")
@@ -841,12 +3867,18 @@ class model():
             print(f"    Length     : {lType['length']:.3f} m")
             print(f"    Diameter   : {lType['MP_data']['input_d']:.3f} m")
             print(f"    design load: {lType['design_load']:.3f} kN")
+            if lType["governing"] != None:
+                print(f"    Governing  : {lType['governing']}")
         print(f"Anchor Parameters")
         for aType in self.AnchTypes:
             print(f"    Type       : {aType['kind']}")
             print(f"    Number     : {aType['num']}")
             print(f"    Mass       : {aType['mass']:.3f} kg")
             print(f"    Soil type  : {aType['soil_type']}")
+            if aType["governing"] != None:
+                print(f"    Governing  : {aType['governing']}")
+            if aType["status"] != None and aType["status"].startswith("fallback"):
+                print(f"    Sizing     : {aType['status']} (solve failed or over budget)")
         print(f"Buoyancy Module Parameters")
         for bType in self.BuoyTypes:
             print(f"    Num Buoys  : {bType['num']}")
@@ -859,6 +3891,8 @@ class model():
         print(f"Total cost      : $ {Total_cost:.2f}  |  {(Total_cost/Total_cost)*100:.1f}%")
         print("---------------------------------------")
 
+        return costs
+
 if __name__ == "__main__":
     tool = model()
     tool.load_database()
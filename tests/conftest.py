@@ -0,0 +1,33 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# the model is a single module at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_draft3 as model_draft
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+def toy_anchor(loadx, loadz, a_type, soil_type):
+    '''anchor solver with mass proportional to the load, so tests run without MoorPy's capacity models'''
+    load = np.hypot(loadx, loadz)
+    return 100.0 + 1e-2 * load, 1e-6 * load
+
+class toy_backend(model_draft.np_backend):
+    '''np_backend with the toy anchor solver'''
+    anchor_solver = staticmethod(toy_anchor)
+
+@pytest.fixture
+def props_backend():
+    '''a quiet toy_backend loaded with the test yamls'''
+    be = toy_backend(verbose = False)
+    be.load([os.path.join(DATA, "lineprops.yaml"), os.path.join(DATA, "pointprops.yaml")])
+    return be
+
+@pytest.fixture
+def np_model(props_backend):
+    '''a quiet model on props_backend'''
+    return model_draft.model(verbose = False, props_backend = props_backend)
@@ -0,0 +1,61 @@
+import concurrent.futures
+import time
+
+import numpy as np
+
+from conftest import toy_anchor
+
+def slow_anchor(loadx, loadz, a_type, soil_type):
+    '''toy anchor solver that hangs above 1 MN'''
+    if np.hypot(loadx, loadz) > 1e6:
+        time.sleep(60)
+    return toy_anchor(loadx, loadz, a_type, soil_type)
+
+def test_hung_solves_do_not_block_later_solves(props_backend):
+    '''solves over the budget are terminated, so they never hold up later solves'''
+    props_backend.anchor_solver = slow_anchor
+    props_backend.set_anchor_budget(timeout = 0.5, fallback = True, workers = 2)
+    props_backend.sizeAnchor("sand", "drag-embedment", 100.0, "horizontal") # cached result to fall back on
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers = 2) as pool:
+        hung = [pool.submit(props_backend.sizeAnchor, "sand", "drag-embedment", load, "horizontal") for load in (2000.0, 3000.0)]
+        time.sleep(0.1)
+        start = time.perf_counter()
+        mass, area, a_type = props_backend.sizeAnchor("sand", "drag-embedment", 200.0, "horizontal")
+        assert props_backend.anchor_status() == "solved"
+        assert time.perf_counter() - start < 2.0
+        for future in hung:
+            future.result()
+
+    assert mass == toy_anchor(200e3, 0, "drag-embedment", "sand")[0]
+    assert props_backend.anchor_fallbacks == 2
+
+def hung_gravity(loadx, loadz, a_type, soil_type):
+    '''toy anchor solver that hangs for gravity anchors'''
+    if a_type == "gravity":
+        time.sleep(60)
+    return toy_anchor(loadx, loadz, a_type, soil_type)
+
+def test_comparison_terminates_hung_solves(props_backend, capsys):
+    '''anchor comparisons use the guarded solves, so a hung type is dropped within the budget and timed'''
+    props_backend.verbose = True
+    props_backend.anchor_solver = hung_gravity
+    props_backend.set_anchor_budget(timeout = 2.0, workers = 2)
+
+    start = time.perf_counter()
+    comparison = props_backend.compareAnchors("sand", 1000.0, "horizontal")
+
+    assert time.perf_counter() - start < 10.0
+    assert np.isnan(comparison["cost"][comparison["types"].index("gravity")])
+    assert np.sum(np.isfinite(comparison["cost"])) == len(comparison["types"]) - 1
+    assert props_backend.anchor_latency()["n"] == len(comparison["types"])
+    assert "TimeoutError: anchor solve exceeded 2.0 s" in capsys.readouterr().out
+
+def test_surrogate_status(props_backend):
+    '''anchors sized from a surrogate report "surrogate", not the status of the previous sizing'''
+    props_backend.fit_anchor_surrogate("sand", "drag-embedment", "horizontal", 100.0, 5000.0, n = 5)
+    props_backend.anchor_local.status = "fallback from 4000.000 kN"
+
+    props_backend.sizeAnchor("sand", "drag-embedment", 1000.0, "horizontal", surrogate = True)
+
+    assert props_backend.anchor_status() == "surrogate"
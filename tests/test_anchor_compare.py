@@ -0,0 +1,33 @@
+import numpy as np
+
+from conftest import toy_anchor
+
+def double_anchor(loadx, loadz, a_type, soil_type):
+    '''toy anchor solver giving twice the toy mass'''
+    mass, area = toy_anchor(loadx, loadz, a_type, soil_type)
+    return 2 * mass, area
+
+def test_comparison_respects_surrogate_flag(props_backend):
+    '''fitted surrogates are only used in comparisons when asked for'''
+    props_backend.fit_anchor_surrogate("sand", "suction", "horizontal", 100.0, 5000.0, n = 5)
+    props_backend.anchor_solver = double_anchor
+    k = props_backend.compareAnchors("sand", 1000.0, "horizontal", workers = 1)["types"].index("suction")
+
+    exact = props_backend.compareAnchors("sand", 1000.0, "horizontal", workers = 1)["mass"][k]
+    fitted = props_backend.compareAnchors("sand", 1000.0, "horizontal", workers = 1, surrogate = True)["mass"][k]
+
+    assert exact == double_anchor(1000e3, 0, "suction", "sand")[0]
+    np.testing.assert_allclose(fitted, toy_anchor(1000e3, 0, "suction", "sand")[0], rtol = 1e-3)
+
+def test_model_keeps_comparison_pool(np_model):
+    '''set_params calls with anchor_select = "cheapest" share one worker pool until the model is closed'''
+    np_model.workers = 1
+    try:
+        np_model.set_paramsA1(shape = "catenary", depth = 200.0, design_load = 1000.0, anchor_select = "cheapest")
+        pool = np_model.executor
+        np_model.set_paramsA1(shape = "taut", depth = 200.0, design_load = 1000.0, anchor_select = "cheapest")
+
+        assert pool != None and np_model.executor is pool
+    finally:
+        np_model.close()
+    assert np_model.executor == None
@@ -0,0 +1,19 @@
+import pytest
+
+import model_draft3 as model_draft
+
+mp = pytest.importorskip("moorpy")
+
+def test_np_backend_matches_moorpy():
+    '''np_backend agrees with the MoorPy backend on the default yamls'''
+    reference = model_draft.backend(verbose = False)
+    reference.load()
+    candidate = model_draft.np_backend(verbose = False)
+    candidate.load()
+
+    errors = model_draft.compare_backends(reference, candidate)
+
+    assert "connection" in errors and "buoy" in errors
+    assert any(key.startswith("anchor") for key in errors)
+    for key, error in errors.items():
+        assert error < 1e-9, f"{key} differs by {error}"
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+@pytest.mark.parametrize("row", [[-1, 200, 1000, -1], [0, 200, 1000, 4], [0.5, 200, 1000, 3]])
+def test_bad_codes_give_nan_rows(np_model, row):
+    '''negative, too large and non integral codes are rejected instead of indexing the keyword tuples'''
+    out = np_model.run_bufferA1([row, [0, 200, 1000, 3]])
+
+    assert np.isnan(out[0]).all()
+    assert np.isfinite(out[1]).all()
+
+def test_bad_anchor_code(np_model):
+    lines = [[3, 0, 0.1, 2.0, 1000.0, 1], [3, 0, 0.1, 2.0, 1000.0, 1]]
+    out = np_model.run_bufferA3([[200, 1, 1], [200, 1, 1]], lines, [[3, -1, 1000.0, 2.0, 3], [3, 0, 1000.0, 2.0, 3]])
+
+    assert np.isnan(out[0]).all()
+    assert np.isfinite(out[1]).all()
+
+@pytest.mark.parametrize("counts", [[2, -1, 1], [1.5, 0.5, 0]])
+def test_bad_row_counts(np_model, counts):
+    '''row counts that are negative or not integral are rejected, even when they add up to the buffer length'''
+    lines = [[3, 0, 0.1, 2.0, 1000.0, 1], [3, 0, 0.1, 2.0, 1000.0, 1]]
+    cases = [[200, n, 0] for n in counts]
+
+    with pytest.raises(Exception, match = "invalid line row counts"):
+        np_model.run_bufferA3(cases, lines, np.zeros((0, 5)))
+    with pytest.raises(Exception, match = "invalid line row counts"):
+        np_model.run_bufferA2([[200, 3, n] for n in counts], np.zeros((2, 8)))
@@ -0,0 +1,48 @@
+import concurrent.futures
+import itertools
+
+import numpy as np
+
+import model_draft3 as model_draft
+
+def cases():
+    '''a mix of A1, A2 and A3 cases'''
+    out = [{"level" : 1, "shape" : shape, "depth" : depth, "design_load" : load, "soil_type" : soil} 
+           for shape, depth, load, soil in itertools.product(model_draft.SHAPES, [80.0, 300.0], [800.0, 4000.0], ["sand", "soft clay"])]
+    out += [{"level" : 2, "Line_Table" : [[3, material, diam, 2.0, 400.0, "horizontal", 1, 2]], "soil_type" : "sand", "depth" : 150.0} 
+            for material, diam in itertools.product(["chain", "polyester", "wire"], [0.05, 0.12])]
+    out += [{"level" : 3, "Line_Table" : [[4, "nylon", diam, 1.8, 300.0, 2]], "Anchor_Table" : [[4, "suction", mass, 0.0, "sand"]], "depth" : 120.0} 
+            for diam, mass in itertools.product([0.08, 0.15], [5e3, 2e4])]
+    return out
+
+def run(model, case):
+    '''sizes and costs a case through the set_params functions'''
+    kwargs = dict(case)
+    level = kwargs.pop("level")
+    getattr(model, f"set_paramsA{level}")(**kwargs)
+    costs = model.calc_cost(report = False)
+    return np.array([costs[key] for key in model_draft.COST_COLUMNS])
+
+def test_threads_match_serial(np_model):
+    '''one model shared by many threads gives the serial results'''
+    batch = cases() * 8
+    serial = np.array([run(np_model, case) for case in batch])
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers = 16) as pool:
+        threaded = np.array(list(pool.map(lambda case : run(np_model, case), batch)))
+
+    np.testing.assert_array_equal(threaded, serial)
+
+def test_state_moves_between_threads(np_model):
+    '''get_state in a worker and set_state in the caller reproduce the worker's costs'''
+    case = cases()[5]
+    def worker():
+        costs = run(np_model, case)
+        return np_model.get_state(), costs
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers = 1) as pool:
+        state, costs = pool.submit(worker).result()
+
+    np_model.set_state(state)
+    result = np_model.calc_cost(report = False)
+    np.testing.assert_array_equal([result[key] for key in model_draft.COST_COLUMNS], costs)
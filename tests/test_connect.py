@@ -0,0 +1,22 @@
+import numpy as np
+
+def test_set_params_uses_connect_table(np_model):
+    '''once a connection table is built, the sizing calls interpolate from it without an exact evaluation'''
+    table = np_model.backend.build_connect_table([500.0, 2000.0])
+
+    np_model.set_paramsA1(shape = "taut", depth = 200.0, design_load = 1234.5, soil_type = "sand")
+
+    assert np_model.backend.con_cache.get(1234.5) == None
+    assert np_model.con_cost == np.interp(1234.5, table["load"], table["cost"]) * np_model.LineTypes[0]["nCon"]
+
+def test_caches_are_bounded(props_backend):
+    '''the connection and anchor memos keep only the most recently used entries'''
+    props_backend.cache_size = 3 # anchor memos are made on first use
+    props_backend.con_cache.size = 3
+    for load in (100.0, 200.0, 300.0, 400.0):
+        props_backend.getConnect(load)
+        props_backend.sizeAnchor("sand", "drag-embedment", load, "horizontal")
+    props_backend.getConnect(200.0)
+
+    assert props_backend.con_cache.keys() == [300.0, 400.0, 200.0]
+    assert props_backend.anchor_results[props_backend.surrogateKey("sand", "drag-embedment", "horizontal")].keys() == [200.0, 300.0, 400.0]
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import model_draft3 as model_draft
+
+@pytest.mark.parametrize("shape", ["catenary", "taut"])
+def test_inverse_design_load_round_trip(np_model, shape):
+    '''the largest design load within the cost of a design is that design's load'''
+    depths = np.array([100.0, 200.0])
+    loads = np.array([1500.0, 3000.0])
+    budget = np_model.run_batch([{"level" : 1, "shape" : shape, "depth" : d, "design_load" : l} for d, l in zip(depths, loads)])[:, -1]
+
+    out = np_model.inverse_A1(budget, variable = "design_load", shape = shape, depth = depths, design_load = 100.0, rtol = 1e-6)
+
+    assert not np.any(out["at_limit"])
+    assert np.all(out["costs"][:, -1] <= budget)
+    np.testing.assert_allclose(out["value"], loads, rtol = 1e-3)
+
+def test_inverse_depth_round_trip(np_model):
+    '''the largest depth within the cost of a design is that design's depth, at the given design load'''
+    budget = np_model.run_case({"level" : 1, "shape" : "taut", "depth" : 200.0, "design_load" : 2000.0})[-1]
+
+    out = np_model.inverse_A1(budget, variable = "depth", shape = "taut", depth = 50.0, design_load = 2000.0, rtol = 1e-6)
+
+    assert out["costs"][0, -1] <= budget
+    np.testing.assert_allclose(out["value"], [200.0], rtol = 1e-3)
+
+def test_inverse_over_budget(np_model):
+    '''sites that cannot afford the lower bound are NaN'''
+    out = np_model.inverse_A1(1.0, shape = "catenary", depth = 100.0, design_load = 100.0)
+    assert np.isnan(out["value"][0])
+
+def test_inverse_array_bounds(np_model):
+    '''lo and hi may be arrays, one per site'''
+    out = np_model.inverse_A1(np.array([2e5, 4e5]), shape = "taut", depth = 200.0, lo = np.array([100.0, 100.0]), hi = np.array([200.0, 400.0]))
+
+    assert np.all(np.isfinite(out["value"]))
+    assert out["value"][1] > out["value"][0]
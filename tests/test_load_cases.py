@@ -0,0 +1,21 @@
+import numpy as np
+
+def test_connections_use_peak_load(np_model):
+    '''connections are sized for the largest load, the line MBL for the case needing the largest MBL'''
+    np_model.set_paramsA1(shape = "catenary", depth = 200.0, Load_Table = [["ULS", 1000.0, 2.0, "none"], ["ALS", 1300.0, 1.4, "none"]])
+
+    line = np_model.LineTypes[0]
+    assert line["design_load"] == 1300.0
+    assert line["FOS"] == 2.0
+    assert line["MP_data"]["MBL"] >= 2000e3 * (1 - 1e-6)
+    assert np_model.con_cost == np_model.backend.getConnect(1300.0) * line["nCon"]
+    assert "ULS" in line["governing"] and "ALS" in line["governing"]
+
+def test_batch_skips_surface_for_load_tables(np_model, tmp_path):
+    '''cases with a Load_Table are run, not answered from the response surface with their design_load'''
+    np_model.build_surface(str(tmp_path / "surface.npz"), depths = [100.0, 300.0], loads = [500.0, 5000.0], shapes = ["catenary"], soils = ["sand"], n_check = 0)
+    case = {"level" : 1, "shape" : "catenary", "depth" : 200.0, "design_load" : 800.0, "Load_Table" : [["ALS", 3000.0, 1.4, "none"]]}
+
+    cost = np_model.run_batch([case])[0]
+
+    np.testing.assert_allclose(cost, np_model.run_case(case))
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+import model_draft3 as model_draft
+
+@pytest.fixture
+def series(tmp_path):
+    '''three years of hourly tension [kN]'''
+    rng = np.random.default_rng(0)
+    hours = np.arange(3 * 8766)
+    tension = 800.0 + 150.0 * np.sin(2 * np.pi * hours / 8766) + 100.0 * rng.standard_normal(len(hours))
+    path = str(tmp_path / "tension.npy")
+    np.save(path, tension)
+    return path
+
+def test_rainflow_sum_independent_of_chunks(series):
+    '''cycles split across chunk boundaries are counted the same as in one pass'''
+    stats = [model_draft.load_pipeline(chunk_size = size, verbose = False).process(series) for size in (97, 5000, 2**20)]
+
+    for other in stats[1:]:
+        np.testing.assert_allclose(other["tn_sum"], stats[0]["tn_sum"], rtol = 1e-12)
+        np.testing.assert_array_equal(other["maxima"], stats[0]["maxima"])
+
+def test_fatigue_sets_only_the_line_mbl(np_model, series):
+    '''when fatigue governs, the line MBL covers it but anchors and connections stay on the extreme load'''
+    loads = np_model.set_paramsA1_series(series, shape = "catenary", depth = 200.0, M = 3.0, K = 1.0)
+    line = np_model.LineTypes[0]
+    mbl, anchor, con_cost = line["MP_data"]["MBL"], np_model.AnchTypes[0]["mass"], np_model.con_cost
+
+    assert loads["governing"] == "fatigue"
+    assert loads["mbl"] == loads["fatigue_mbl"] > 2 * loads["extreme_load"]
+    assert mbl >= loads["fatigue_mbl"] * 1000 * (1 - 1e-6)
+    assert line["design_load"] == loads["extreme_load"]
+
+    np_model.set_paramsA1(shape = "catenary", depth = 200.0, design_load = loads["extreme_load"])
+    assert anchor == np_model.AnchTypes[0]["mass"]
+    assert con_cost == np_model.con_cost
+    assert mbl > np_model.LineTypes[0]["MP_data"]["MBL"]
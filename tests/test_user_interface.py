@@ -0,0 +1,35 @@
+import concurrent.futures
+import io
+import sys
+
+import model_draft3 as model_draft
+import user_interface_draft3 as ui
+
+def test_ui_holds_background_messages(props_backend, capsys, monkeypatch):
+    '''the UI precompute keeps sizing messages off the prompts and prints them when the candidate is used'''
+    props_backend.verbose = True
+    output = ui.held_output(sys.stdout)
+    monkeypatch.setattr(sys, "stdout", output)
+    model = model_draft.model(props_backend = props_backend)
+    with concurrent.futures.ThreadPoolExecutor(max_workers = 2) as pool:
+        database = pool.submit(lambda: None)
+        candidate = ui.precompute(pool, output, model, database, 1, shape = "catenary", depth = 200.0, design_load = 1000.0, soil_type = "sand")
+        candidate.result()
+    assert capsys.readouterr().out == ""
+
+    ui.use_candidate(model, candidate)
+
+    assert "INFO: 'drag-embedment' anchor mass set to" in capsys.readouterr().out
+    assert model.LineTypes[0]["MP_data"]["material"] == "chain"
+
+def test_held_output_forwards_terminal_attributes():
+    '''input() only uses readline line editing when stdout reports a terminal file'''
+    class terminal(io.StringIO):
+        def fileno(self):
+            return 1
+        def isatty(self):
+            return True
+    output = ui.held_output(terminal())
+
+    assert output.fileno() == 1
+    assert output.isatty()
@@ -0,0 +1,9 @@
+def test_validate_without_curve_limits(np_model):
+    '''lineProps without MBL_dmin / MBL_dmax have no diameter limits, as in MoorPy's default yaml'''
+    for mat in np_model.backend.lineProps.values():
+        mat.pop("MBL_dmin", None)
+        mat.pop("MBL_dmax", None)
+    case = {"level" : 3, "Line_Table" : [[3, "chain", 0.1, 2.0, 500.0, 2]], "Anchor_Table" : [[3, "suction", 2e4, 0.0, "sand"]], "depth" : 200.0}
+
+    assert np_model.validate_tables([case]) == {}
+    assert np_model.validate_tables([dict(case, Line_Table = [[3, "chain", -0.1, 2.0, 500.0, 2]])]) != {}
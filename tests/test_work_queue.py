@@ -0,0 +1,21 @@
+import os
+
+import model_draft3 as model_draft
+
+def test_claim_skips_shard_requeued_before_lease(tmp_path, monkeypatch):
+    '''a shard moved back to pending between the rename and the lease start is skipped, not an error'''
+    queue = model_draft.work_queue(str(tmp_path), verbose = False)
+    queue.submit([{"level" : 1, "shape" : "taut", "depth" : 200.0, "design_load" : load, "soil_type" : "sand"} for load in (500.0, 800.0)], shard_size = 1)
+    first = queue.shards("pending")[0]
+    utime = os.utime
+    def requeue_first(path, *args, **kwargs):
+        if os.path.basename(path) == first + ".json": # the rename kept the old mtime, so the lease looked expired
+            os.rename(path, os.path.join(queue.dirs["pending"], first + ".json"))
+        return utime(path, *args, **kwargs)
+    monkeypatch.setattr(os, "utime", requeue_first)
+
+    name, shard = queue.claim()
+
+    assert name == queue.shards("leased")[0] and name != first
+    assert shard["cases"][0]["design_load"] == 800.0
+    assert queue.shards("pending") == [first]
@@ -1,6 +1,9 @@
+import concurrent.futures
 import logging
 import platform
 import os
+import sys
+import threading
 import time
 import model_draft3 as model_draft 
 
@@ -132,13 +135,117 @@ def ask_table(headers, answers, types, rows, ignore_case = True):
 
     return table
 
+# ---------- Background Precompute ----------
+class held_output:
+    '''stdout wrapper that holds the text printed by background threads so the messages can be 
+    printed on the main thread once their result is used, instead of over the prompts'''
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local() # text held for each thread, None prints through
+
+    def write(self, text):
+        held = getattr(self.local, "held", None)
+        if held == None:
+            return self.stream.write(text)
+        held.append(text)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        '''forwards everything else (fileno, isatty, encoding, ...) to the wrapped stream, so input() keeps readline line editing'''
+        return getattr(self.__dict__["stream"], name)
+
+    def hold(self, func, *args, **kwargs):
+        '''calls func holding its printed text, returns the result and the text'''
+        self.local.held = []
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            text = "".join(self.local.held)
+            self.local.held = None
+        return result, text
+
+def get_database(pool, databases, path = None):
+    '''starts loading a database in the background, or reuses one loaded in an earlier pass
+    
+    Parameters
+    ----------
+    pool : concurrent.futures.Executor
+        the background worker pool
+    databases : dictionary
+        loaded backends and their load futures, keyed by path
+    path : list (optional)
+        paths to the lineprops and pointprops yamls. None uses the defaults
+    
+    Returns
+    -------
+    backend : model_draft.backend
+        the backend holding the database
+    future : concurrent.futures.Future
+        completes when the database is loaded
+    '''  
+    key = str(path)
+    if key in databases:
+        backend, future = databases[key]
+        if not future.cancelled() and (not future.done() or future.exception() == None):
+            return backend, future
+    backend = model_draft.backend()
+    future = pool.submit(backend.load, path)
+    databases[key] = (backend, future)
+    return backend, future
+
+def precompute(pool, output, model, database, level, **kwargs):
+    '''sizes a candidate system in the background once the database is loaded
+    
+    Parameters
+    ----------
+    pool : concurrent.futures.Executor
+        the background worker pool
+    output : held_output
+        holds the sizing messages until the candidate is used
+    model : model_draft.model
+        the model to size with. The system state is kept in the worker thread
+    database : concurrent.futures.Future
+        the database load (see get_database)
+    level : int
+        the input level (1, 2 or 3)
+    kwargs
+        the keyword arguments of the matching set_params function
+    
+    Returns
+    -------
+    concurrent.futures.Future
+        returns the system state (see model.get_state) to move to the main thread with model.set_state, 
+        and the sizing messages to print there
+    '''  
+    def size():
+        getattr(model, f"set_paramsA{level}")(**kwargs)
+        return model.get_state()
+    def run():
+        database.result()
+        return output.hold(size)
+    return pool.submit(run)
+
+def use_candidate(model, candidate):
+    '''prints the held sizing messages of a precomputed candidate and moves its state to the model'''
+    state, text = candidate.result()
+    print(text, end = "")
+    model.set_state(state)
+
 # ------ User Interface DRAFT -----
 if __name__ == "__main__":
     '''this is the main user interface to be replicated in SAM'''
     
     clear_console()
+    output = held_output(sys.stdout) # background sizing messages are printed when the candidate is used
+    sys.stdout = output
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers = 2) # background database loads and sizing
+    databases = {} # loaded databases are kept between passes
     end = False
     while not end:
+        futures = [] # background work for this pass
         print("----------\nWelcome to the SAM user interface draft 3. \nThis built to work in command consoles.\nThis attempts to simulate the dropdown menu paths you can take with the proposed SAM user interface. \nOnce you fill out all the required information for a given path you will see the cost printed. \nYou can restart the script at any time by typing restart as an input. \nYou can end the script at any time by typing exit as an input.\n\nDISCLAIMER: This is a work in progress, and there are no checks to ensure inputs are realsitic for the described systems. \nAll negative numerical inputs are assumed positive via abs() \n\nEnjoy!\n----------")
         try:
             inputs = ask("Import WEC? (y/n) ", ["y","n"])
@@ -146,13 +253,10 @@ if __name__ == "__main__":
                 inputs = ask("Foundation type (1: floating, 2: bottom fixed)? ", ["1", "2"])
                 if inputs == "1":
                     
-                    # running the model
-                    model = model_draft.model()
-
                     # load in data from MoorPy structures (TODO: do we even want users to know this? Or should it just be always defaults)
                     inputs = ask("Use default mooring system properties? (y or <path to lineprops yaml>, <path to pointprops yaml>) ")
                     if inputs == "y": 
-                        model.load_database()
+                        path = None
                     elif (inputs != "y") and (", " not in inputs):
                         print(f"Invalid path provided: {inputs}. Restarting...")
                         raise Restart
@@ -162,7 +266,10 @@ if __name__ == "__main__":
                         if len(path) != 2:
                             print("Two paths must be provided. Restarting...")
                             raise Restart
-                        model.load_database(path)
+
+                    # running the model. The database loads and candidate systems are sized in the background while the remaining questions are asked
+                    backend, database = get_database(pool, databases, path)
+                    model = model_draft.model(props_backend = backend)
 
                     depth = abs(ask("Depth (m)? ", dtype = "float"))
                     # inflation scale disabled for now
@@ -182,10 +289,13 @@ if __name__ == "__main__":
                         # default is catenary
                         inputs1 = ask("Mooring configuration [default is catenary] (catenary, semi-taut, taut, tension)? ", ["catenary", "semi-taut", "taut", "tension"])
                         inputs2 = ask("Design load (kN)? ", dtype = "float")
+                        # size the system for every soil while the soil type is asked
+                        candidates = {soil : precompute(pool, output, model, database, 1, shape = inputs1, depth = depth, design_load = inputs2, soil_type = soil, Buoy_Table = buoys) for soil in model_draft.SOILS}
+                        futures += list(candidates.values())
                         # default is sand
                         inputs3 = ask("Soil type [default is sand] (soft clay, medium clay, hard clay, sand)? ", ["soft clay", "medium clay", "hard clay", "sand"])
 
-                        model.set_paramsA1(shape = inputs1, depth = depth, design_load = inputs2, soil_type = inputs3, Buoy_Table = buoys)
+                        use_candidate(model, candidates[inputs3])
 
                     elif inputs == "2": # line data 
 
@@ -197,9 +307,12 @@ if __name__ == "__main__":
 
                             lines = ask_table(headers, answers, types, inputs1)  # a list of lists, one for each line type in the system. Values are: "Num of these lines", "Line material", "Diameter (m)", "Length (m)", "Anchor load direction", "Number of anchors for line"
 
+                            # size the system for every soil while the soil type is asked
+                            candidates = {soil : precompute(pool, output, model, database, 2, Line_Table = lines, depth = depth, soil_type = soil, Buoy_Table = buoys) for soil in model_draft.SOILS}
+                            futures += list(candidates.values())
                             inputs2 = ask("Soil type (soft clay, medium clay, hard clay, sand)? ", ["soft clay", "medium clay", "hard clay", "sand"])
 
-                            model.set_paramsA2(Line_Table = lines, depth = depth, soil_type = inputs2, Buoy_Table = buoys)
+                            use_candidate(model, candidates[inputs2])
                         
                         else: 
                             print("1 or more lines required for the line data option. Restarting...")
@@ -224,6 +337,7 @@ if __name__ == "__main__":
                         else: # if no anchors just an empty list
                             anchors = []
 
+                        database.result()
                         model.set_paramsA3(Line_Table = lines, Anchor_Table = anchors, depth = depth, Buoy_Table = buoys) 
 
                     else:
@@ -258,5 +372,10 @@ if __name__ == "__main__":
             if inputs == "n":
                 clear_console()
                 end = True
+        finally:
+            for future in futures: # drop sizing that is no longer needed
+                future.cancel()
 
+    pool.shutdown(wait = False, cancel_futures = True)
+    sys.stdout = output.stream
     print("------------------------\nThanks for using draft 3! \n--------- END ----------")
\ No newline at end of file